@@ -0,0 +1,10 @@
+"""
+Entry point for `python -m queuectl`.
+
+Same CLI as the `queuectl` console script, without going through the
+installed wrapper script.
+"""
+from queuectl.cli import main
+
+if __name__ == '__main__':
+    main(prog_name='queuectl')
@@ -1,12 +1,221 @@
 """CLI command definitions for queuectl."""
+import atexit
 import click
-import json
-import uuid
-import multiprocessing
-import time
-from queuectl.models import Job
-from queuectl.storage import Storage
-from queuectl.worker import Worker
+import importlib
+import os
+import signal
+import sys
+from queuectl.models import epoch_to_iso, utc_now_iso
+
+# Heavier imports (orjson, secrets, multiprocessing, Storage, Worker, Job) are
+# done inside the commands that need them, so `queuectl --help` and simple
+# commands don't pay their import cost on every invocation.
+
+
+# Process-wide Storage instance, created on first use (see _get_storage)
+_STORAGE = None
+
+
+def _get_storage():
+    """
+    Return the Storage instance shared by all commands in this process.
+
+    Creating Storage runs the schema/migration checks, so this is done
+    once per process instead of once per command.
+    """
+    global _STORAGE
+    if _STORAGE is None:
+        from queuectl.storage import Storage
+        _STORAGE = Storage()
+        atexit.register(_STORAGE.close)
+    return _STORAGE
+
+
+# Valid job priorities (display order) and a set for O(1) membership checks
+_PRIORITY_NAMES = ('high', 'medium', 'low')
+_PRIORITIES = frozenset(_PRIORITY_NAMES)
+_DEFAULT_PRIORITY = 'medium'
+
+# Pre-built validation error texts. Each is written to stderr with a single
+# click.echo call; dynamic ones are format strings filled in at the call site.
+_EX_JOB = '  {"command": "echo hello"}'
+_ERR_MISSING_COMMAND = (
+    "Error: Missing required field 'command'\n"
+    "\nThe 'command' field is required and must contain the shell command to execute.\n"
+    "\nExample:\n" + _EX_JOB
+)
+_ERR_EMPTY_COMMAND = (
+    "Error: Field 'command' cannot be empty\n"
+    "\nThe 'command' field must be a string containing a valid shell command.\n"
+    "\nExample:\n" + _EX_JOB
+)
+_ERR_COMMAND_TYPE = (
+    "Error: Field 'command' must be a string, not {}\n"
+    "\nThe 'command' field must be a string containing a valid shell command.\n"
+    "\nExample:\n"
+    '  {{"command": "echo hello"}}'
+)
+_ERR_EMPTY_ID = (
+    "Error: Field 'id' cannot be empty\n"
+    "\nIf you provide an 'id' field, it must be a non-empty string.\n"
+    "Tip: You can omit the 'id' field and one will be auto-generated."
+)
+_ERR_ID_TYPE = (
+    "Error: Field 'id' must be a string, not {}\n"
+    "\nIf you provide an 'id' field, it must be a non-empty string.\n"
+    "Tip: You can omit the 'id' field and one will be auto-generated."
+)
+_ERR_INVALID_PRIORITY = (
+    "Error: Invalid priority '{}'\n"
+    "\nPriority must be one of: " + ', '.join(_PRIORITY_NAMES) + "\n"
+    "\nExample:\n"
+    '  {{"command": "echo hello", "priority": "high"}}'
+)
+_ERR_INVALID_MAX_RETRIES = (
+    "Error: Invalid max_retries '{}'\n"
+    "\nmax_retries must be a non-negative integer.\n"
+    "\nExample:\n"
+    '  {{"command": "echo hello", "max_retries": 5}}'
+)
+_ERR_INVALID_JSON = (
+    "Error: Invalid JSON - {}\n"
+    "Position: line {}, column {}\n"
+    "\nExample of valid JSON:\n"
+    '  {{"command": "echo hello"}}'
+)
+_ERR_NOT_OBJECT = (
+    "Error: JSON must be an object (dictionary), not a list or primitive value\n"
+    "\nExample of valid JSON:\n" + _EX_JOB
+)
+
+# Valid job states, shared by the `list --state` choice and `status` counts
+_JOB_STATES = ('pending', 'processing', 'completed', 'failed', 'dead')
+
+# Per-job output blocks for `list` and `dlq list`
+_LIST_JOB_TEMPLATE = (
+    "\nJob ID: {id}\n"
+    "  Command: {command}\n"
+    "  Priority: {priority}\n"
+    "  State: {state}\n"
+    "  Attempts: {attempts}/{max_retries}\n"
+    "  Created: {created_at}\n"
+    "  Updated: {updated_at}\n"
+)
+_DLQ_JOB_TEMPLATE = (
+    "\nJob ID: {id}\n"
+    "  Command: {command}\n"
+    "  Priority: {priority}\n"
+    "  State: {state}\n"
+    "  Failed Attempts: {attempts}/{max_retries}\n"
+    "  Created: {created_at}\n"
+    "  Last Updated: {updated_at}\n"
+)
+
+# Display labels for `--fields` output
+_FIELD_LABELS = {
+    'id': 'Job ID',
+    'command': 'Command',
+    'priority': 'Priority',
+    'state': 'State',
+    'attempts': 'Attempts',
+    'max_retries': 'Max Retries',
+    'created_at': 'Created',
+    'updated_at': 'Updated',
+    'locked_by': 'Locked By',
+    'locked_at': 'Locked At',
+    'next_retry_at': 'Next Retry At',
+}
+
+
+class _FastChoice(click.Choice):
+    """
+    click.Choice with a frozenset fast path for exact matches.
+
+    A valid value is accepted with one hash lookup, skipping Choice's
+    normalization pass. Anything else falls through to click.Choice, so
+    metavar, shell completion and the "invalid choice" error are Click's own.
+    """
+
+    def __init__(self, choices):
+        super().__init__(choices)
+        self._lookup = frozenset(self.choices)
+
+    def convert(self, value, param, ctx):
+        if value in self._lookup:
+            return value
+        return super().convert(value, param, ctx)
+
+
+def _parse_fields(ctx, param, value):
+    """Click callback: split a comma-separated --fields value and check the column names."""
+    from queuectl.storage import JOB_COLUMNS
+
+    if not value:
+        return None
+    fields = [name.strip() for name in value.split(',') if name.strip()]
+    unknown = [name for name in fields if name not in JOB_COLUMNS]
+    if unknown:
+        raise click.BadParameter(
+            f"unknown field(s): {', '.join(unknown)} (choose from: {', '.join(JOB_COLUMNS)})"
+        )
+    return fields
+
+
+def _write_out(text):
+    """
+    Write pre-formatted output straight to stdout and flush once.
+
+    Used for the bulk output of `list`, `dlq list` and `status`, skipping
+    click.echo's per-call stream/colour handling. sys.stdout is looked up
+    at call time so redirected streams are respected; click.echo is still
+    used for headers and for all stderr output.
+    """
+    sys.stdout.write(text)
+    sys.stdout.flush()
+
+
+# Default --limit for `list` / `dlq list`, so a huge history isn't read by accident
+_DEFAULT_LIST_LIMIT = 1000
+
+# Rows rendered per stdout write when streaming `list` / `dlq list` output
+_WRITE_CHUNK_ROWS = 500
+
+
+def _write_rows(rows, render):
+    """
+    Render rows and stream them to stdout in chunks of _WRITE_CHUNK_ROWS.
+
+    Rows are consumed lazily (e.g. from Storage.iter_jobs), so neither the
+    full result set nor the full output text is ever held in memory.
+
+    Args:
+        rows: Iterable of job rows
+        render: Callable turning one row into its output text
+
+    Returns:
+        Number of rows written
+    """
+    count = 0
+    chunk = []
+    for row in rows:
+        chunk.append(render(row))
+        if len(chunk) == _WRITE_CHUNK_ROWS:
+            _write_out("".join(chunk))
+            count += len(chunk)
+            chunk = []
+    if chunk:
+        _write_out("".join(chunk))
+        count += len(chunk)
+    return count
+
+
+def _format_job_fields(job):
+    """Format only the selected columns of a job row, in selection order (for --fields)."""
+    return "\n" + "".join(
+        f"{'' if name == 'id' else '  '}{_FIELD_LABELS[name]}: "
+        f"{epoch_to_iso(value) if name == 'next_retry_at' and value is not None else value}\n"
+        for name, value in zip(job.keys(), job)
+    )
 
 
 @click.group()
@@ -16,75 +225,115 @@ def main():
     pass
 
 
+# JSON type names for parsed values, keyed by Python type name (the `list`
+# and `set` commands below shadow those builtins in this module)
+_JSON_TYPE_NAMES = {
+    'bool': 'a boolean',
+    'int': 'a number',
+    'float': 'a number',
+    'list': 'an array',
+    'dict': 'an object',
+}
+
+
+def _json_type_name(value):
+    """Name the JSON type of a parsed value, for validation error messages."""
+    name = type(value).__name__
+    return _JSON_TYPE_NAMES.get(name, name)
+
+
+def _validate_job_dict(job_data):
+    """
+    Validate a parsed job dictionary and normalize its fields in place.
+
+    Shared by `enqueue` and `enqueue-batch`. Checks the fixed job shape
+    (required non-empty string 'command', optional non-empty string 'id',
+    'priority' enum, non-negative integer 'max_retries') in a single pass.
+    On invalid input, echoes a descriptive error to stderr and raises
+    click.Abort.
+
+    Args:
+        job_data: Parsed job dictionary (must contain 'command')
+    """
+    # 'command' must be present and a non-blank string (one lookup, no str() copy)
+    command = job_data.get('command')
+    if command is None:
+        click.echo(_ERR_MISSING_COMMAND, err=True)
+        raise click.Abort()
+    if not isinstance(command, str):
+        click.echo(_ERR_COMMAND_TYPE.format(_json_type_name(command)), err=True)
+        raise click.Abort()
+    if not command.strip():
+        click.echo(_ERR_EMPTY_COMMAND, err=True)
+        raise click.Abort()
+
+    # 'id' is optional, but if provided it must be a non-blank string
+    job_id = job_data.get('id')
+    if job_id is not None:
+        if not isinstance(job_id, str):
+            click.echo(_ERR_ID_TYPE.format(_json_type_name(job_id)), err=True)
+            raise click.Abort()
+        if not job_id.strip():
+            click.echo(_ERR_EMPTY_ID, err=True)
+            raise click.Abort()
+
+    # Validate 'priority' field (must be 'high', 'medium', or 'low'; defaults to 'medium')
+    priority = job_data.get('priority', _DEFAULT_PRIORITY)
+    if isinstance(priority, str):
+        priority = priority.lower()  # Normalize to lowercase
+    if not isinstance(priority, str) or priority not in _PRIORITIES:
+        click.echo(_ERR_INVALID_PRIORITY.format(job_data['priority']), err=True)
+        raise click.Abort()
+    job_data['priority'] = priority
+
+    # Validate 'max_retries' field if provided (must be a non-negative integer)
+    if 'max_retries' in job_data:
+        max_retries = job_data['max_retries']
+        # bool is an int subclass, but true/false is almost certainly a mistake here
+        if type(max_retries) is not int or max_retries < 0:
+            click.echo(_ERR_INVALID_MAX_RETRIES.format(max_retries), err=True)
+            raise click.Abort()
+
+
 @main.command()
 @click.argument('job_json', required=True)
 def enqueue(job_json):
     """Add a new job to the queue.
 
-    JOB_JSON: JSON string containing job data (e.g., '{"id":"job1","command":"sleep 2"}')
+    JOB_JSON: JSON string containing job data (e.g., '{"id":"job1","command":"sleep 2"}'),
+    or '-' to read it from stdin (no shell quoting needed)
     """
+    import orjson
+    import secrets
+
+    # '-' reads the raw bytes from stdin; orjson parses bytes directly,
+    # so there's no text decode step
+    if job_json == '-':
+        job_json = sys.stdin.buffer.read()
+
     # Step 1: Parse JSON with error handling
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError, so msg/lineno/colno are available
     try:
-        job_data = json.loads(job_json)
-    except json.JSONDecodeError as e:
-        click.echo(f"Error: Invalid JSON - {e.msg}", err=True)
-        click.echo(f"Position: line {e.lineno}, column {e.colno}", err=True)
-        click.echo("\nExample of valid JSON:", err=True)
-        click.echo('  {"command": "echo hello"}', err=True)
+        job_data = orjson.loads(job_json)
+    except orjson.JSONDecodeError as e:
+        click.echo(_ERR_INVALID_JSON.format(e.msg, e.lineno, e.colno), err=True)
         raise click.Abort()
 
     # Check that we got a dictionary (not a list, string, etc.)
     if not isinstance(job_data, dict):
-        click.echo("Error: JSON must be an object (dictionary), not a list or primitive value", err=True)
-        click.echo("\nExample of valid JSON:", err=True)
-        click.echo('  {"command": "echo hello"}', err=True)
+        click.echo(_ERR_NOT_OBJECT, err=True)
         raise click.Abort()
 
     click.echo(f"✓ Successfully parsed JSON with {len(job_data)} field(s)")
 
     # Step 2: Validate required fields
-    # Check if 'command' field exists
-    if 'command' not in job_data:
-        click.echo("Error: Missing required field 'command'", err=True)
-        click.echo("\nThe 'command' field is required and must contain the shell command to execute.", err=True)
-        click.echo("\nExample:", err=True)
-        click.echo('  {"command": "echo hello"}', err=True)
-        raise click.Abort()
-
-    # Check if 'command' is not empty
-    if not job_data['command'] or not str(job_data['command']).strip():
-        click.echo("Error: Field 'command' cannot be empty", err=True)
-        click.echo("\nThe 'command' field must contain a valid shell command.", err=True)
-        click.echo("\nExample:", err=True)
-        click.echo('  {"command": "echo hello"}', err=True)
-        raise click.Abort()
-
-    # Validate 'id' field if provided (must not be empty)
-    if 'id' in job_data and (not job_data['id'] or not str(job_data['id']).strip()):
-        click.echo("Error: Field 'id' cannot be empty", err=True)
-        click.echo("\nIf you provide an 'id' field, it must not be empty.", err=True)
-        click.echo("Tip: You can omit the 'id' field and one will be auto-generated.", err=True)
-        raise click.Abort()
-
-    # Validate 'priority' field if provided (must be 'high', 'medium', or 'low')
-    valid_priorities = ['high', 'medium', 'low']
-    if 'priority' in job_data:
-        priority = str(job_data['priority']).lower()
-        if priority not in valid_priorities:
-            click.echo(f"Error: Invalid priority '{job_data['priority']}'", err=True)
-            click.echo(f"\nPriority must be one of: {', '.join(valid_priorities)}", err=True)
-            click.echo("\nExample:", err=True)
-            click.echo('  {"command": "echo hello", "priority": "high"}', err=True)
-            raise click.Abort()
-        job_data['priority'] = priority  # Normalize to lowercase
-    else:
-        job_data['priority'] = 'medium'  # Default priority
+    _validate_job_dict(job_data)
 
     click.echo(f"✓ Validation passed")
 
-    # Step 3: Generate UUID if 'id' not provided
-    if 'id' not in job_data or not job_data['id']:
-        job_data['id'] = str(uuid.uuid4())
+    # Step 3: Generate a random 32-hex-digit ID if 'id' not provided
+    if not job_data.get('id'):
+        job_data['id'] = secrets.token_hex(16)
         click.echo(f"✓ Generated job ID: {job_data['id']}")
     else:
         click.echo(f"✓ Using provided job ID: {job_data['id']}")
@@ -93,33 +342,123 @@ def enqueue(job_json):
 
     # Step 4: Save job to database
     try:
-        # Create Storage instance
-        storage = Storage()
+        # Reuse the process-wide Storage instance
+        storage = _get_storage()
+
+        # Build the row directly from the validated data (no Job object needed)
+        now = utc_now_iso()
+        job = {
+            'id': job_data['id'],
+            'command': job_data['command'],
+            'priority': job_data['priority'],
+            'state': 'pending',
+            'attempts': 0,
+            'max_retries': job_data.get('max_retries', 3),  # Allow optional max_retries
+            'created_at': now,
+            'updated_at': now
+        }
+
+        # Save to database and wake an idle worker
+        storage.create_job(job)
+        storage.notify_new_jobs()
+
+        click.echo(f"\n✓ Job successfully enqueued!")
+        click.echo(f"  Job ID: {job['id']}")
+        click.echo(f"  Priority: {job['priority']}")
+        click.echo(f"  State: {job['state']}")
+        click.echo(f"  Max Retries: {job['max_retries']}")
+
+    except Exception as e:
+        click.echo(f"\nError: Failed to save job to database", err=True)
+        click.echo(f"  {str(e)}", err=True)
+        raise click.Abort()
+
+
+@main.command(name='enqueue-batch')
+@click.argument('path', type=click.File('rb'), required=True)
+def enqueue_batch(path):
+    """Add many jobs to the queue from an NDJSON file.
+
+    PATH: File with one JSON job object per line (use '-' to read from stdin)
+
+    All jobs are validated first and then inserted in a single transaction,
+    so either every job is enqueued or none are.
+
+    Example:
+      queuectl enqueue-batch jobs.ndjson
+    """
+    import orjson
+    from queuectl.models import Job
+
+    jobs_data = []
+
+    # Step 1: Parse and validate every line before touching the database
+    for lineno, line in enumerate(path, start=1):
+        if not line.strip():
+            continue  # Allow blank lines
+
+        try:
+            job_data = orjson.loads(line)
+        except orjson.JSONDecodeError as e:
+            click.echo(f"Error: Invalid JSON on line {lineno} - {e.msg}", err=True)
+            click.echo(f"Position: column {e.colno}", err=True)
+            click.echo("\nNo jobs were enqueued.", err=True)
+            raise click.Abort()
+
+        if not isinstance(job_data, dict):
+            click.echo(f"Error: Line {lineno} must be a JSON object (dictionary)", err=True)
+            click.echo("\nNo jobs were enqueued.", err=True)
+            raise click.Abort()
+
+        try:
+            _validate_job_dict(job_data)
+        except click.Abort:
+            click.echo(f"\nRejected line {lineno}; no jobs were enqueued.", err=True)
+            raise
+
+        jobs_data.append(job_data)
 
-        # Create Job object with validated data
-        job = Job(
+    if not jobs_data:
+        click.echo("No jobs found in input.")
+        return
+
+    # Generate IDs for jobs without one from a single urandom read (16 bytes each)
+    missing_id = [job_data for job_data in jobs_data if not job_data.get('id')]
+    if missing_id:
+        buf = os.urandom(16 * len(missing_id))
+        for i, job_data in enumerate(missing_id):
+            job_data['id'] = buf[i * 16:(i + 1) * 16].hex()
+
+    # One timestamp for the whole batch instead of one per job
+    now = utc_now_iso()
+
+    rows = [
+        Job(
             id=job_data['id'],
             command=job_data['command'],
             priority=job_data['priority'],
             state='pending',
             attempts=0,
-            max_retries=job_data.get('max_retries', 3)  # Allow optional max_retries
-        )
-
-        # Save to database
-        storage.create_job(job.to_dict())
-
-        click.echo(f"\n✓ Job successfully enqueued!")
-        click.echo(f"  Job ID: {job.id}")
-        click.echo(f"  Priority: {job.priority}")
-        click.echo(f"  State: {job.state}")
-        click.echo(f"  Max Retries: {job.max_retries}")
-
+            max_retries=job_data.get('max_retries', 3),
+            created_at=now,
+            updated_at=now
+        ).to_row()
+        for job_data in jobs_data
+    ]
+
+    # Step 2: Insert all jobs in one transaction
+    try:
+        storage = _get_storage()
+        storage.create_jobs_bulk(rows)
+        storage.notify_new_jobs(len(rows))
     except Exception as e:
-        click.echo(f"\nError: Failed to save job to database", err=True)
+        click.echo("Error: Failed to save jobs to database", err=True)
         click.echo(f"  {str(e)}", err=True)
+        click.echo("\nNo jobs were enqueued.", err=True)
         raise click.Abort()
 
+    click.echo(f"✓ {len(rows)} job(s) successfully enqueued!")
+
 
 @main.group()
 def worker():
@@ -127,7 +466,7 @@ def worker():
     pass
 
 
-def worker_process_runner(worker_id: str):
+def worker_process_runner(worker_id: str, concurrency: int = 1):
     """
     Function to run a worker in a separate process.
 
@@ -135,19 +474,48 @@ def worker_process_runner(worker_id: str):
 
     Args:
         worker_id: Unique identifier for this worker
+        concurrency: Jobs the worker may run at the same time
     """
+    from queuectl.worker import Worker
+
     worker_instance = Worker(worker_id=worker_id)
-    worker_instance.run()
+    worker_instance.run_concurrent(concurrency)
+
+
+def _raise_keyboard_interrupt(signum, frame):
+    """Signal handler that routes a signal into the Ctrl+C shutdown path."""
+    raise KeyboardInterrupt
+
+
+def _prewarm():
+    """
+    Prepare the database and worker code before worker processes are started.
+
+    Runs the schema/migration checks once in the parent. The parent's cached
+    connection is tagged with its pid, so forked workers open their own
+    instead of sharing it. The worker module is loaded here too, so every
+    forked worker inherits it already imported.
+    """
+    importlib.import_module('queuectl.worker')
+    _get_storage()
 
 
 @worker.command()
 @click.option('--count', default=1, type=int, help='Number of workers to start')
-def start(count):
+@click.option('--concurrency', default=1, type=int, show_default=True,
+              help='Jobs each worker runs at the same time')
+def start(count, concurrency):
     """Start one or more worker processes."""
+    import multiprocessing
+
     if count < 1:
         click.echo("Error: Count must be at least 1", err=True)
         raise click.Abort()
 
+    if concurrency < 1:
+        click.echo("Error: Concurrency must be at least 1", err=True)
+        raise click.Abort()
+
     if count > 10:
         click.echo("Warning: Starting more than 10 workers may cause performance issues.")
         if not click.confirm("Continue anyway?"):
@@ -156,6 +524,17 @@ def start(count):
     try:
         click.echo(f"Starting {count} worker(s)...\n")
 
+        # On Linux, fork so each worker inherits the already-imported modules
+        # instead of re-importing everything; elsewhere keep the platform default
+        # (spawn on Windows, and on macOS where fork is unsafe with system frameworks)
+        if sys.platform.startswith('linux'):
+            ctx = multiprocessing.get_context('fork')
+        else:
+            ctx = multiprocessing.get_context()
+
+        # Create/migrate the schema once here so workers start against a ready database
+        _prewarm()
+
         # Create a list to hold worker processes
         processes = []
 
@@ -164,9 +543,9 @@ def start(count):
             worker_id = f"worker-{i+1}"
 
             # Create a new process for this worker
-            process = multiprocessing.Process(
+            process = ctx.Process(
                 target=worker_process_runner,
-                args=(worker_id,),
+                args=(worker_id, concurrency),
                 name=worker_id
             )
 
@@ -178,6 +557,11 @@ def start(count):
 
         click.echo(f"\n{count} worker(s) running. Press Ctrl+C to stop all workers.\n")
 
+        # Treat SIGTERM to this parent like Ctrl+C, so `kill <pid>` stops the
+        # workers too instead of orphaning them. Installed after forking, so
+        # workers keep their own handlers.
+        signal.signal(signal.SIGTERM, _raise_keyboard_interrupt)
+
         # Wait for all processes to complete
         # This blocks until user presses Ctrl+C or workers exit
         try:
@@ -215,49 +599,63 @@ def stop():
 def status():
     """Show summary of all job states & active workers."""
     try:
-        storage = Storage()
-        counts = storage.get_job_counts()
+        storage = _get_storage()
+
+        # One GROUP BY query, pivoted into per-state and per-priority totals
+        counts = dict.fromkeys(_JOB_STATES, 0)
+        priority_counts = dict.fromkeys(_PRIORITY_NAMES, 0)
+        for (job_state, priority), count in storage.get_state_priority_counts().items():
+            counts[job_state] = counts.get(job_state, 0) + count
+
+            # Priority breakdown only covers active jobs
+            if job_state in ('pending', 'processing'):
+                priority = priority or _DEFAULT_PRIORITY
+                if priority in priority_counts:
+                    priority_counts[priority] += count
 
         # Calculate total
         total = sum(counts.values())
 
-        click.echo("Job Queue Status")
-        click.echo("=" * 50)
-        click.echo("\nJobs by State:")
-        click.echo(f"  Pending:     {counts['pending']:>6}")
-        click.echo(f"  Processing:  {counts['processing']:>6}")
-        click.echo(f"  Completed:   {counts['completed']:>6}")
-        click.echo(f"  Failed:      {counts['failed']:>6}")
-        click.echo(f"  Dead (DLQ):  {counts['dead']:>6}")
-        click.echo("-" * 50)
-        click.echo(f"  Total:       {total:>6}")
+        # Collect the report and write it in one go
+        lines = []
+        lines.append("Job Queue Status")
+        lines.append("=" * 50)
+        lines.append("\nJobs by State:")
+        lines.append(f"  Pending:     {counts['pending']:>6}")
+        lines.append(f"  Processing:  {counts['processing']:>6}")
+        lines.append(f"  Completed:   {counts['completed']:>6}")
+        lines.append(f"  Failed:      {counts['failed']:>6}")
+        lines.append(f"  Dead (DLQ):  {counts['dead']:>6}")
+        lines.append("-" * 50)
+        lines.append(f"  Total:       {total:>6}")
 
         # Show percentage if there are jobs
         if total > 0:
-            click.echo("\nCompletion Rate:")
+            lines.append("\nCompletion Rate:")
             completion_rate = (counts['completed'] / total) * 100
-            click.echo(f"  {completion_rate:.1f}% ({counts['completed']}/{total})")
+            lines.append(f"  {completion_rate:.1f}% ({counts['completed']}/{total})")
 
             if counts['dead'] > 0:
                 failure_rate = (counts['dead'] / total) * 100
-                click.echo(f"\nPermanent Failures:")
-                click.echo(f"  {failure_rate:.1f}% ({counts['dead']}/{total})")
+                lines.append("\nPermanent Failures:")
+                lines.append(f"  {failure_rate:.1f}% ({counts['dead']}/{total})")
 
         # Show active work
         active_jobs = counts['pending'] + counts['processing']
         if active_jobs > 0:
-            click.echo(f"\nActive/Pending Work: {active_jobs} job(s)")
+            lines.append(f"\nActive/Pending Work: {active_jobs} job(s)")
 
             # Show priority breakdown for active jobs
-            priority_counts = storage.get_priority_counts()
             priority_total = sum(priority_counts.values())
             if priority_total > 0:
-                click.echo("\nActive Jobs by Priority:")
-                click.echo(f"  High:        {priority_counts['high']:>6}")
-                click.echo(f"  Medium:      {priority_counts['medium']:>6}")
-                click.echo(f"  Low:         {priority_counts['low']:>6}")
+                lines.append("\nActive Jobs by Priority:")
+                lines.append(f"  High:        {priority_counts['high']:>6}")
+                lines.append(f"  Medium:      {priority_counts['medium']:>6}")
+                lines.append(f"  Low:         {priority_counts['low']:>6}")
 
-        click.echo("=" * 50)
+        lines.append("=" * 50)
+
+        _write_out("\n".join(lines) + "\n")
 
     except Exception as e:
         click.echo(f"Error: Failed to get status", err=True)
@@ -266,16 +664,20 @@ def status():
 
 
 @main.command()
-@click.option('--state', type=click.Choice(['pending', 'processing', 'completed', 'failed', 'dead']),
-              help='Filter jobs by state')
-def list(state):
+@click.option('--state', type=_FastChoice(_JOB_STATES), help='Filter jobs by state')
+@click.option('--limit', type=click.IntRange(min=1), default=_DEFAULT_LIST_LIMIT, show_default=True,
+              help='Maximum number of jobs to show')
+@click.option('--offset', type=click.IntRange(min=0), help='Number of jobs to skip')
+@click.option('--fields', callback=_parse_fields,
+              help='Comma-separated columns to show (e.g. id,state,attempts)')
+def list(state, limit, offset, fields):
     """List jobs by state."""
     try:
-        # Create Storage instance
-        storage = Storage()
+        # Reuse the process-wide Storage instance
+        storage = _get_storage()
 
-        # Query jobs with optional state filter
-        jobs = storage.list_jobs(state=state)
+        # Stream jobs with optional state filter, paging and column selection
+        jobs = storage.iter_jobs(state=state, limit=limit, offset=offset, fields=fields)
 
         # Display header
         if state:
@@ -284,24 +686,20 @@ def list(state):
             click.echo("All jobs")
         click.echo("-" * 80)
 
+        # Display each job as it is read, written to stdout in chunks
+        render = _format_job_fields if fields else _LIST_JOB_TEMPLATE.format_map
+        total = _write_rows(jobs, render)
+
         # Check if any jobs found
-        if not jobs:
+        if not total:
             click.echo("No jobs found.")
             return
 
-        # Display each job
-        for job in jobs:
-            click.echo(f"\nJob ID: {job['id']}")
-            click.echo(f"  Command: {job['command']}")
-            click.echo(f"  Priority: {job.get('priority', 'medium')}")
-            click.echo(f"  State: {job['state']}")
-            click.echo(f"  Attempts: {job['attempts']}/{job['max_retries']}")
-            click.echo(f"  Created: {job['created_at']}")
-            click.echo(f"  Updated: {job['updated_at']}")
-
         # Show total count
         click.echo("-" * 80)
-        click.echo(f"Total: {len(jobs)} job(s)")
+        click.echo(f"Total: {total} job(s)")
+        if total == limit:
+            click.echo(f"(Showing at most {limit}; use --limit/--offset to see more.)")
 
     except Exception as e:
         click.echo(f"Error: Failed to list jobs", err=True)
@@ -316,39 +714,41 @@ def dlq():
 
 
 @dlq.command(name='list')
-def dlq_list():
+@click.option('--limit', type=click.IntRange(min=1), default=_DEFAULT_LIST_LIMIT, show_default=True,
+              help='Maximum number of jobs to show')
+@click.option('--offset', type=click.IntRange(min=0), help='Number of jobs to skip')
+@click.option('--fields', callback=_parse_fields,
+              help='Comma-separated columns to show (e.g. id,attempts,updated_at)')
+def dlq_list(limit, offset, fields):
     """List jobs in the Dead Letter Queue (permanently failed jobs)."""
     try:
-        # Create Storage instance
-        storage = Storage()
+        # Reuse the process-wide Storage instance
+        storage = _get_storage()
 
-        # Query for dead jobs
-        dead_jobs = storage.list_jobs(state='dead')
+        # Query for dead jobs, most recently failed first
+        dead_jobs = storage.iter_jobs(state='dead', limit=limit, offset=offset, fields=fields,
+                                      newest_first=True)
 
         # Display header
         click.echo("Dead Letter Queue (DLQ)")
         click.echo("=" * 80)
         click.echo("These jobs have failed permanently after exhausting all retries.\n")
 
+        # Display each dead job as it is read, written to stdout in chunks
+        render = _format_job_fields if fields else _DLQ_JOB_TEMPLATE.format_map
+        total = _write_rows(dead_jobs, render)
+
         # Check if any jobs found
-        if not dead_jobs:
+        if not total:
             click.echo("No jobs in DLQ.")
             click.echo("\nTip: Jobs are sent to DLQ after failing max_retries times.")
             return
 
-        # Display each dead job
-        for job in dead_jobs:
-            click.echo(f"\nJob ID: {job['id']}")
-            click.echo(f"  Command: {job['command']}")
-            click.echo(f"  Priority: {job.get('priority', 'medium')}")
-            click.echo(f"  State: {job['state']}")
-            click.echo(f"  Failed Attempts: {job['attempts']}/{job['max_retries']}")
-            click.echo(f"  Created: {job['created_at']}")
-            click.echo(f"  Last Updated: {job['updated_at']}")
-
         # Show total count
         click.echo("=" * 80)
-        click.echo(f"Total jobs in DLQ: {len(dead_jobs)}")
+        click.echo(f"Total jobs in DLQ: {total}")
+        if total == limit:
+            click.echo(f"(Showing at most {limit}; use --limit/--offset to see more.)")
         click.echo("\nTo retry a job: queuectl dlq retry <JOB_ID>")
 
     except Exception as e:
@@ -371,7 +771,7 @@ def retry(job_id):
       queuectl dlq retry abc-123
     """
     try:
-        storage = Storage()
+        storage = _get_storage()
 
         # Check if job exists
         job = storage.get_job(job_id)
@@ -399,12 +799,8 @@ def retry(job_id):
             raise click.Abort()
 
         # Reset job to pending state with attempts back to 0
-        storage.update_job(job_id, {
-            'state': 'pending',
-            'attempts': 0,
-            'locked_by': None,
-            'locked_at': None
-        })
+        storage.requeue_job(job_id)
+        storage.notify_new_jobs()
 
         click.echo(f"\n✓ Job '{job_id}' has been reset and moved back to the queue")
         click.echo(f"  New state: pending")
@@ -437,10 +833,10 @@ def set(key, value):
       queuectl config set backoff-base 2
     """
     try:
-        storage = Storage()
+        storage = _get_storage()
 
         # Validate known config keys (optional - warn if unknown)
-        known_keys = ['max-retries', 'backoff-base', 'backoff-initial-delay']
+        known_keys = ['max-retries', 'backoff-base', 'backoff-initial-delay', 'claim-batch-size', 'log-dir']
         if key not in known_keys:
             click.echo(f"Warning: '{key}' is not a standard config key.", err=True)
             click.echo(f"Known keys: {', '.join(known_keys)}", err=True)
@@ -471,13 +867,15 @@ def get(key):
       queuectl config get backoff-base
     """
     try:
-        storage = Storage()
+        storage = _get_storage()
 
         # Define defaults for known keys
         defaults = {
             'max-retries': '3',
             'backoff-base': '2',
-            'backoff-initial-delay': '1'
+            'backoff-initial-delay': '1',
+            'claim-batch-size': '1',
+            'log-dir': ''
         }
 
         default = defaults.get(key)
@@ -504,7 +902,7 @@ def get(key):
 def list_config():
     """List all configuration values."""
     try:
-        storage = Storage()
+        storage = _get_storage()
         config = storage.list_config()
 
         if not config:
@@ -513,6 +911,8 @@ def list_config():
             click.echo("  max-retries = 3")
             click.echo("  backoff-base = 2")
             click.echo("  backoff-initial-delay = 1")
+            click.echo("  claim-batch-size = 1")
+            click.echo("  log-dir = (unset)")
             return
 
         click.echo("Configuration:")
@@ -1,10 +1,50 @@
 """
 Data models for the job queue system.
 """
-from datetime import datetime, timezone
+import time
 from typing import Optional
 
 
+# (whole second, formatted 'YYYY-MM-DDTHH:MM:SS' prefix) of the last call
+_ISO_SECOND_CACHE = (None, '')
+
+
+def utc_now_iso(offset_seconds: float = 0) -> str:
+    """
+    Return the current UTC time (plus an optional offset) as an ISO 8601 string.
+
+    A cheaper drop-in for datetime.now(timezone.utc).isoformat() on the write
+    path. The date/time prefix is formatted once per second and reused, so
+    most calls only format the microseconds. Output is always fixed-width
+    ('2024-01-01T00:00:00.000000+00:00'), so timestamps compare correctly
+    as strings.
+
+    Args:
+        offset_seconds: Seconds to add to the current time (e.g. a retry delay)
+    """
+    global _ISO_SECOND_CACHE
+    ns = time.time_ns()
+    if offset_seconds:
+        ns += int(offset_seconds * 1_000_000_000)
+    second, remainder = divmod(ns, 1_000_000_000)
+    cached_second, prefix = _ISO_SECOND_CACHE
+    if second != cached_second:
+        prefix = time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(second))
+        _ISO_SECOND_CACHE = (second, prefix)
+    return f"{prefix}.{remainder // 1000:06d}+00:00"
+
+
+def epoch_to_iso(seconds: float) -> str:
+    """
+    Format a unix timestamp as a UTC ISO 8601 string, in utc_now_iso()'s format.
+
+    Used to display times stored as unix seconds (next_retry_at).
+    """
+    whole, fraction = divmod(seconds, 1)
+    prefix = time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(whole))
+    return f"{prefix}.{int(fraction * 1_000_000):06d}+00:00"
+
+
 class Job:
     """
     Represents a job in the queue system.
@@ -18,9 +58,16 @@ class Job:
         max_retries: Maximum number of retry attempts allowed
         created_at: When the job was created
         updated_at: When the job was last updated
-        next_retry_at: When the job should be retried (for exponential backoff)
+        next_retry_at: Unix time (seconds) when the job should be retried
+            (for exponential backoff)
     """
 
+    # Declared in jobs-table column order; to_row() and to_dict() rely on it
+    __slots__ = (
+        'id', 'command', 'priority', 'state', 'attempts', 'max_retries',
+        'created_at', 'updated_at', 'next_retry_at'
+    )
+
     def __init__(
         self,
         id: str,
@@ -31,7 +78,7 @@ class Job:
         max_retries: int = 3,
         created_at: Optional[str] = None,
         updated_at: Optional[str] = None,
-        next_retry_at: Optional[str] = None
+        next_retry_at: Optional[float] = None
     ):
         self.id = id
         self.command = command
@@ -39,23 +86,35 @@ class Job:
         self.state = state
         self.attempts = attempts
         self.max_retries = max_retries
-        self.created_at = created_at or datetime.now(timezone.utc).isoformat()
-        self.updated_at = updated_at or datetime.now(timezone.utc).isoformat()
+        # Format the current time once and share it between both timestamps
+        now = None
+        if created_at is None or updated_at is None:
+            now = utc_now_iso()
+        self.created_at = created_at or now
+        self.updated_at = updated_at or now
         self.next_retry_at = next_retry_at
 
+    def to_row(self) -> tuple:
+        """
+        Convert Job to a tuple in jobs-table column order.
+
+        Used by bulk inserts (executemany) where a per-row dict is never needed.
+        """
+        return (
+            self.id,
+            self.command,
+            self.priority,
+            self.state,
+            self.attempts,
+            self.max_retries,
+            self.created_at,
+            self.updated_at,
+            self.next_retry_at
+        )
+
     def to_dict(self):
         """Convert Job to dictionary for storage."""
-        return {
-            'id': self.id,
-            'command': self.command,
-            'priority': self.priority,
-            'state': self.state,
-            'attempts': self.attempts,
-            'max_retries': self.max_retries,
-            'created_at': self.created_at,
-            'updated_at': self.updated_at,
-            'next_retry_at': self.next_retry_at
-        }
+        return dict(zip(self.__slots__, self.to_row()))
 
     @classmethod
     def from_dict(cls, data: dict):
@@ -72,5 +131,20 @@ class Job:
             next_retry_at=data.get('next_retry_at')
         )
 
+    @classmethod
+    def from_row(cls, row):
+        """
+        Create Job from a row tuple in slot order (the inverse of to_row()).
+
+        Skips __init__ and the per-key dict lookups of from_dict; the row is
+        unpacked straight into the slots. Used for rows selected with
+        Job.__slots__ as the column list.
+        """
+        self = cls.__new__(cls)
+        (self.id, self.command, self.priority, self.state, self.attempts,
+         self.max_retries, self.created_at, self.updated_at,
+         self.next_retry_at) = row
+        return self
+
     def __repr__(self):
         return f"Job(id={self.id}, command={self.command}, state={self.state})"
@@ -1,10 +1,109 @@
 """
 SQLite storage layer for the job queue system.
 """
+import errno
+import select
 import sqlite3
 import os
-from typing import Optional, List, Dict, Any
+import threading
+import time
+from typing import Optional, List, Dict, Any, Tuple, Iterator
 from contextlib import contextmanager
+from queuectl.models import Job, utc_now_iso
+
+
+# Stored in PRAGMA user_version once tables, indexes and migrations are in
+# place. Bump it whenever _create_tables gains a new table, index or migration.
+SCHEMA_VERSION = 6
+
+# Seconds a Storage instance serves config values from memory before re-reading
+CONFIG_CACHE_TTL = 5.0
+
+# UPDATE ... RETURNING needs SQLite 3.35+
+_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+# Read-only probe run before a claim: in WAL mode readers never wait for the
+# write lock, so workers finding nothing to claim stay off it entirely
+_CLAIMABLE_EXISTS_SQL = """
+    SELECT 1
+    FROM jobs INDEXED BY idx_claim_order
+    WHERE state = 'pending'
+      AND locked_by IS NULL
+      AND (next_retry_at IS NULL OR next_retry_at <= ?)
+    LIMIT 1
+"""
+
+# Candidate ids read per round by the compare-and-swap claim fallback
+_CLAIM_CANDIDATES = 8
+
+# All job states, in lifecycle order
+JOB_STATES = ('pending', 'processing', 'completed', 'failed', 'dead')
+
+# get_job_counts: one column per state, in JOB_STATES order. SUM over the
+# 0/1 comparison rather than COUNT(*) FILTER, which needs SQLite 3.30+;
+# COALESCE turns an empty table's NULL sums into 0
+_JOB_COUNTS_SQL = "SELECT {} FROM jobs".format(
+    ', '.join(f"COALESCE(SUM(state = '{state}'), 0)" for state in JOB_STATES)
+)
+
+# Job state transitions: one fixed statement each, so a transition costs a
+# single write with no SQL built at runtime (and stays prepared in sqlite3's
+# per-connection statement cache). updated_at is always the last-but-one
+# parameter and the job id the last.
+_JOB_TRANSITION_SQL = {
+    'processing': """
+        UPDATE jobs
+        SET state = 'processing', updated_at = ?
+        WHERE id = ?
+    """,
+    'complete': """
+        UPDATE jobs
+        SET state = 'completed', locked_by = NULL, locked_at = NULL, updated_at = ?
+        WHERE id = ?
+    """,
+    'retry': """
+        UPDATE jobs
+        SET state = 'pending', attempts = ?, next_retry_at = ?,
+            locked_by = NULL, locked_at = NULL, updated_at = ?
+        WHERE id = ?
+    """,
+    'dlq': """
+        UPDATE jobs
+        SET state = 'dead', attempts = ?, next_retry_at = NULL,
+            locked_by = NULL, locked_at = NULL, updated_at = ?
+        WHERE id = ?
+    """,
+    # Claimed job handed back unfinished (attempts unchanged)
+    'release': """
+        UPDATE jobs
+        SET state = 'pending', locked_by = NULL, locked_at = NULL, updated_at = ?
+        WHERE id = ?
+    """,
+    # Job moved back to the queue from the DLQ with a fresh retry budget
+    'requeue': """
+        UPDATE jobs
+        SET state = 'pending', attempts = 0, locked_by = NULL, locked_at = NULL, updated_at = ?
+        WHERE id = ?
+    """,
+}
+
+# Numeric priority stored alongside the text label, so claim ordering is a
+# plain integer compare that an index can serve (higher runs first)
+PRIORITY_INT = {'high': 3, 'medium': 2, 'low': 1}
+
+# Insert a new job from its 9 Job.to_row() values; priority_int is derived
+# from the priority parameter (?3) in SQL, so callers never pass it
+_INSERT_JOB_SQL = """
+    INSERT INTO jobs (id, command, priority, state, attempts, max_retries, created_at, updated_at, next_retry_at, priority_int)
+    VALUES (?1, ?2, ?3, ?4, ?5, ?6, ?7, ?8, ?9,
+            CASE ?3 WHEN 'high' THEN 3 WHEN 'low' THEN 1 ELSE 2 END)
+"""
+
+# All columns of the jobs table, in table order
+JOB_COLUMNS = (
+    'id', 'command', 'priority', 'state', 'attempts', 'max_retries',
+    'created_at', 'updated_at', 'locked_by', 'locked_at', 'next_retry_at'
+)
 
 
 class Storage:
@@ -21,39 +120,258 @@ class Storage:
         Initialize storage with database path.
 
         Args:
-            db_path: Path to SQLite database file (defaults to QUEUECTL_DB_PATH env var or 'queue.db')
+            db_path: Path to SQLite database file (defaults to QUEUECTL_DB_PATH env var or 'queue.db').
+                SQLite URIs starting with 'file:' are also accepted; e.g.
+                'file:queue?mode=memory&cache=shared' keeps the whole queue in
+                RAM and shared by every connection in this process (handy for
+                tests and benchmarks, as no disk I/O or fsync happens).
         """
         if db_path is None:
             # Check environment variable first, then use default
             db_path = os.environ.get('QUEUECTL_DB_PATH', 'queue.db')
         self.db_path = db_path
+        # 'file:' paths are SQLite URIs (query parameters like mode=memory)
+        self._uri = db_path.startswith('file:')
+        # Named pipe next to the database used to wake idle workers when a job
+        # is enqueued (see notify_new_jobs / wait_for_job). Only on-disk
+        # databases on platforms with mkfifo get one; others fall back to polling.
+        self.notify_path = None
+        if hasattr(os, 'mkfifo') and not self._uri and db_path != ':memory:':
+            self.notify_path = db_path + '.notify'
+        self._notify_fds = None  # (read fd, keep-alive write fd) once opened
+        # One long-lived connection per thread, reused by every operation
+        self._tls = threading.local()
+        # update_job SQL text per distinct tuple of updated columns. Reusing
+        # the identical string lets sqlite3's statement cache skip recompiling.
+        self._update_stmt_cache: Dict[Tuple[str, ...], str] = {}
+        # Config values read through get_config/list_config (None = key absent),
+        # dropped every CONFIG_CACHE_TTL seconds so changes made by other
+        # processes (e.g. `queuectl config set` while workers run) are seen
+        self._config_cache: Dict[str, Optional[str]] = {}
+        self._config_cache_expires = 0.0
         self._ensure_db_exists()
 
     def _ensure_db_exists(self):
-        """Create database and tables if they don't exist."""
+        """
+        Create database and tables if they don't exist.
+
+        The schema version is stored in PRAGMA user_version. A database that
+        is already at SCHEMA_VERSION skips all DDL and table_info migration
+        probes, so opening an up-to-date database costs a single PRAGMA read.
+        """
         with self._get_connection() as conn:
+            if conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION:
+                return
+
+            # WAL lets readers run alongside a writer. The journal mode is
+            # stored in the database file, so it only needs setting once.
+            conn.execute("PRAGMA journal_mode=WAL")
             self._create_tables(conn)
+            # PRAGMA values can't be bound as parameters
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    @staticmethod
+    def _configure_connection(conn: sqlite3.Connection) -> None:
+        """
+        Apply the per-connection PRAGMAs used for every job queue connection.
+
+        - synchronous=NORMAL: in WAL mode, skip the fsync on every commit
+          (the WAL is still synced at checkpoints)
+        - temp_store=MEMORY: keep sort/temp b-trees off disk
+        - cache_size=-65536: 64 MiB page cache
+        - mmap_size=268435456: read pages through a 256 MiB memory map
+        - busy_timeout=5000: wait up to 5s for a competing writer instead
+          of failing immediately with SQLITE_BUSY
+        """
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-65536")
+        conn.execute("PRAGMA mmap_size=268435456")
+        conn.execute("PRAGMA busy_timeout=5000")
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a new SQLite connection configured for the job queue."""
+        # Larger prepared-statement cache (default 128) so every fixed query
+        # text used by the queue stays compiled on the long-lived connection
+        conn = sqlite3.connect(self.db_path, cached_statements=256, uri=self._uri)
+        conn.row_factory = sqlite3.Row  # Rows support row['column'] and row.keys()
+        self._configure_connection(conn)
+        return conn
+
+    def _thread_connection(self) -> sqlite3.Connection:
+        """
+        Return this thread's cached connection, opening it on first use.
+
+        The owning process id is stored with the connection: a connection
+        inherited across fork() must not be used by the child, so a forked
+        worker transparently opens its own.
+        """
+        tls = self._tls
+        conn = getattr(tls, 'conn', None)
+        if conn is None or tls.pid != os.getpid():
+            conn = self._connect()
+            tls.conn = conn
+            tls.pid = os.getpid()
+        return conn
+
+    @staticmethod
+    def _tuple_cursor(conn: sqlite3.Connection) -> sqlite3.Cursor:
+        """
+        Return a cursor on conn whose rows are plain tuples.
+
+        Used where rows are unpacked positionally (or zipped with a fixed
+        column tuple), which skips building a sqlite3.Row per row.
+        """
+        cursor = conn.cursor()
+        cursor.row_factory = None
+        return cursor
 
     @contextmanager
     def _get_connection(self):
         """
-        Context manager for database connections.
+        Context manager for database transactions.
 
-        This ensures connections are properly closed after use.
+        Yields the thread's long-lived connection, commits on success and
+        rolls back on error. The connection is kept open for the next call;
+        use close() to release it.
         Usage:
             with storage._get_connection() as conn:
                 conn.execute(...)
         """
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row  # Return rows as dictionaries
+        conn = self._thread_connection()
         try:
             yield conn
             conn.commit()  # Auto-commit on success
         except Exception:
             conn.rollback()  # Rollback on error
             raise
+
+    def close(self) -> None:
+        """Close the calling thread's cached connection and the wakeup pipe, if open."""
+        conn = getattr(self._tls, 'conn', None)
+        if conn is not None and self._tls.pid == os.getpid():
+            conn.close()
+        self._tls.conn = None
+
+        if self._notify_fds is not None:
+            for fd in self._notify_fds:
+                os.close(fd)
+            self._notify_fds = None
+
+    def _open_notify_pipe(self) -> Optional[int]:
+        """
+        Create (if needed) and open the wakeup FIFO for reading.
+
+        A write end is kept open alongside the read end, so the FIFO never
+        reports end-of-file while no enqueuer has it open and select() only
+        wakes up for real notifications.
+
+        Returns:
+            The non-blocking read fd, or None if the FIFO can't be used
+        """
+        if self._notify_fds is None:
+            try:
+                try:
+                    os.mkfifo(self.notify_path, 0o600)
+                except FileExistsError:
+                    pass
+                read_fd = os.open(self.notify_path, os.O_RDONLY | os.O_NONBLOCK)
+                write_fd = os.open(self.notify_path, os.O_WRONLY | os.O_NONBLOCK)
+            except OSError:
+                self.notify_path = None  # Not usable here; poll instead
+                return None
+            self._notify_fds = (read_fd, write_fd)
+        return self._notify_fds[0]
+
+    def notify_new_jobs(self, count: int = 1) -> None:
+        """
+        Wake up to `count` workers blocked in wait_for_job().
+
+        Writes one byte per job (capped at 64) to the wakeup FIFO. Never
+        blocks and never fails: with no worker listening, or a full pipe,
+        the notification is simply dropped (workers still poll as a safety net).
+
+        Args:
+            count: Number of jobs just made available
+        """
+        if self.notify_path is None:
+            return
+        try:
+            fd = os.open(self.notify_path, os.O_WRONLY | os.O_NONBLOCK)
+        except OSError:
+            return  # ENOENT / ENXIO: no worker has the FIFO open
+        try:
+            os.write(fd, b'x' * min(max(count, 1), 64))
+        except OSError as e:
+            if e.errno not in (errno.EAGAIN, errno.EWOULDBLOCK):
+                raise
         finally:
-            conn.close()  # Always close connection
+            os.close(fd)
+
+    def wait_for_job(self, timeout: float, interrupt_fd: Optional[int] = None) -> bool:
+        """
+        Block until a job is enqueued or the timeout expires.
+
+        Waits in select() on the wakeup FIFO, so an idle worker costs no CPU
+        and reacts to notify_new_jobs() immediately. Each wakeup consumes one
+        notification byte, leaving the rest for other workers.
+
+        Args:
+            timeout: Maximum seconds to wait
+            interrupt_fd: Optional extra fd (e.g. the read end of a worker's
+                shutdown self-pipe) that also ends the wait when readable.
+                It is not read from here.
+
+        Returns:
+            True if woken by a notification, False on timeout, interrupt
+            (or when wakeups aren't available and this just slept)
+        """
+        read_fd = self._open_notify_pipe() if self.notify_path else None
+        fds = [fd for fd in (read_fd, interrupt_fd) if fd is not None]
+        if not fds:
+            time.sleep(timeout)
+            return False
+
+        readable, _, _ = select.select(fds, [], [], timeout)
+        # On interrupt, leave any notification byte for the other workers
+        if interrupt_fd in readable or read_fd not in readable:
+            return False
+        try:
+            os.read(read_fd, 1)
+        except BlockingIOError:
+            return False  # Another worker took this notification
+        return True
+
+    def notify_fileno(self) -> Optional[int]:
+        """
+        File descriptor that becomes readable when jobs are enqueued.
+
+        For event loops that watch the wakeup FIFO themselves (e.g. with
+        loop.add_reader) instead of blocking in wait_for_job(); call
+        wait_for_job(0) when it is readable to consume the notification.
+
+        Returns:
+            The FIFO's read fd, or None if wakeups aren't available (poll)
+        """
+        return self._open_notify_pipe() if self.notify_path else None
+
+    def seconds_until_next_retry(self) -> Optional[float]:
+        """
+        Seconds until the earliest scheduled retry becomes due.
+
+        Returns:
+            0 or more seconds, or None if no pending job is waiting on a retry
+        """
+        with self._get_connection() as conn:
+            row = conn.execute("""
+                SELECT MIN(next_retry_at)
+                FROM jobs INDEXED BY idx_retry_due
+                WHERE state = 'pending'
+                  AND next_retry_at IS NOT NULL
+            """).fetchone()
+        if row[0] is None:
+            return None
+        return max(0.0, row[0] - time.time())
 
     def _create_tables(self, conn: sqlite3.Connection):
         """
@@ -76,7 +394,8 @@ class Storage:
                 updated_at TEXT NOT NULL,
                 locked_by TEXT,
                 locked_at TEXT,
-                next_retry_at TEXT
+                next_retry_at REAL,
+                priority_int INTEGER NOT NULL DEFAULT 2
             )
         """)
 
@@ -88,10 +407,51 @@ class Storage:
             )
         """)
 
-        # Create index on state for faster queries
+        # Migrate existing database: Add locking columns if they don't exist
+        self._migrate_add_locking_fields(conn)
+
+        # Migrate existing database: Add retry scheduling field
+        self._migrate_add_retry_at_field(conn)
+
+        # Migrate existing database: Add priority field
+        self._migrate_add_priority_field(conn)
+
+        # Migrate existing database: Add numeric priority
+        self._migrate_add_priority_int_field(conn)
+
+        # Migrate existing database: Store next_retry_at as unix seconds.
+        # Rebuilds the table, so it runs before any index is created
+        self._migrate_retry_at_to_real(conn)
+
+        # Create index for state-filtered listings in creation order. It also
+        # serves plain state lookups, which made the old idx_jobs_state redundant.
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_jobs_state_created
+            ON jobs(state, created_at)
+        """)
+        conn.execute("DROP INDEX IF EXISTS idx_jobs_state")
+
+        # Create index for unfiltered listings in creation order. Its entries
+        # are ordered by (created_at, rowid), matching list ORDER BY exactly,
+        # so a LIMIT stops after reading that many entries with no sort step.
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_jobs_created
+            ON jobs(created_at)
+        """)
+
+        # Create index for state-filtered, most-recently-updated-first listings (DLQ)
         conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_jobs_state
-            ON jobs(state)
+            CREATE INDEX IF NOT EXISTS idx_jobs_state_updated
+            ON jobs(state, updated_at DESC)
+        """)
+
+        # Indexes on columns added by migrations are created after them,
+        # so older databases have the columns by the time they're indexed
+
+        # Create covering index for the (state, priority) breakdown used by `status`
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_jobs_state_priority
+            ON jobs(state, priority)
         """)
 
         # Create index on priority for faster queries
@@ -100,14 +460,34 @@ class Storage:
             ON jobs(priority)
         """)
 
-        # Migrate existing database: Add locking columns if they don't exist
-        self._migrate_add_locking_fields(conn)
+        # Create partial index holding only claimable jobs, in claim order:
+        # priority_int (highest first), then creation time. Claims walk it from
+        # the front and stop at the first retry-ready row, with no sort; it
+        # stays as small as the pending backlog. Replaces the earlier
+        # creation-order and CASE-expression versions.
+        conn.execute("DROP INDEX IF EXISTS idx_jobs_claimable")
+        conn.execute("DROP INDEX IF EXISTS idx_pending_claim")
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_claim_order
+            ON jobs(priority_int DESC, created_at)
+            WHERE state = 'pending' AND locked_by IS NULL
+        """)
 
-        # Migrate existing database: Add retry scheduling field
-        self._migrate_add_retry_at_field(conn)
+        # Create partial index of scheduled retries, for the earliest-due lookup
+        # in seconds_until_next_retry()
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_retry_due
+            ON jobs(next_retry_at)
+            WHERE state = 'pending' AND next_retry_at IS NOT NULL
+        """)
 
-        # Migrate existing database: Add priority field
-        self._migrate_add_priority_field(conn)
+        # Create partial index holding only locked (claimed) jobs, by lock time,
+        # for the stale-lock scan in find_stale_locks()
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_jobs_locked
+            ON jobs(locked_at)
+            WHERE locked_by IS NOT NULL
+        """)
 
         conn.commit()
 
@@ -143,7 +523,7 @@ class Storage:
 
         # Add next_retry_at if missing
         if 'next_retry_at' not in columns:
-            conn.execute("ALTER TABLE jobs ADD COLUMN next_retry_at TEXT")
+            conn.execute("ALTER TABLE jobs ADD COLUMN next_retry_at REAL")
 
     def _migrate_add_priority_field(self, conn: sqlite3.Connection):
         """
@@ -160,6 +540,93 @@ class Storage:
         if 'priority' not in columns:
             conn.execute("ALTER TABLE jobs ADD COLUMN priority TEXT DEFAULT 'medium'")
 
+    def _migrate_retry_at_to_real(self, conn: sqlite3.Connection):
+        """
+        Migration: Convert next_retry_at from ISO 8601 TEXT to REAL unix seconds.
+
+        A column's type can't be altered in SQLite, so the jobs table is
+        rebuilt under the current schema and the rows copied across, with
+        existing retry times converted via julianday(). Runs after the other
+        column migrations, so every column exists on both sides.
+
+        The rebuild runs in one BEGIN IMMEDIATE transaction: an interrupted
+        upgrade leaves the old table untouched, and a second process
+        upgrading the same database waits for the first, then finds the
+        column already converted.
+        """
+        if not self._retry_at_is_text(conn):
+            return
+
+        # Commit what the earlier migrations left open, so BEGIN can start
+        if conn.in_transaction:
+            conn.commit()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Re-check under the write lock: another process may have
+            # converted the table while this one waited
+            if not self._retry_at_is_text(conn):
+                conn.commit()
+                return
+
+            columns = ', '.join(JOB_COLUMNS + ('priority_int',))
+            converted = columns.replace(
+                'next_retry_at', '(julianday(next_retry_at) - 2440587.5) * 86400.0'
+            )
+            # Left behind by an upgrade interrupted before this was atomic
+            conn.execute("DROP TABLE IF EXISTS jobs_new")
+            conn.execute("""
+                CREATE TABLE jobs_new (
+                    id TEXT PRIMARY KEY,
+                    command TEXT NOT NULL,
+                    priority TEXT DEFAULT 'medium',
+                    state TEXT NOT NULL,
+                    attempts INTEGER DEFAULT 0,
+                    max_retries INTEGER DEFAULT 3,
+                    created_at TEXT NOT NULL,
+                    updated_at TEXT NOT NULL,
+                    locked_by TEXT,
+                    locked_at TEXT,
+                    next_retry_at REAL,
+                    priority_int INTEGER NOT NULL DEFAULT 2
+                )
+            """)
+            # rowid is copied too: it's the claim tiebreak for equal created_at
+            conn.execute(f"""
+                INSERT INTO jobs_new (rowid, {columns})
+                SELECT rowid, {converted}
+                FROM jobs
+            """)
+            conn.execute("DROP TABLE jobs")
+            conn.execute("ALTER TABLE jobs_new RENAME TO jobs")
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+
+    @staticmethod
+    def _retry_at_is_text(conn: sqlite3.Connection) -> bool:
+        """Whether next_retry_at still has its old TEXT column type."""
+        cursor = conn.execute("PRAGMA table_info(jobs)")
+        types = {row[1]: row[2].upper() for row in cursor.fetchall()}
+        return types.get('next_retry_at', 'REAL') != 'REAL'
+
+    def _migrate_add_priority_int_field(self, conn: sqlite3.Connection):
+        """
+        Migration: Add priority_int (3/2/1 for high/medium/low) to the jobs table.
+
+        Backfills it from the text priority; new jobs get it in _INSERT_JOB_SQL.
+        """
+        cursor = conn.execute("PRAGMA table_info(jobs)")
+        columns = [row[1] for row in cursor.fetchall()]
+
+        if 'priority_int' not in columns:
+            conn.execute("ALTER TABLE jobs ADD COLUMN priority_int INTEGER NOT NULL DEFAULT 2")
+            conn.execute("""
+                UPDATE jobs
+                SET priority_int = CASE priority WHEN 'high' THEN 3 WHEN 'low' THEN 1 ELSE 2 END
+                WHERE priority IN ('high', 'low')
+            """)
+
     def get_connection(self):
         """
         Public method to get a database connection.
@@ -167,9 +634,7 @@ class Storage:
         Returns a connection object that can be used for queries.
         Caller is responsible for closing the connection.
         """
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+        return self._connect()
 
     def create_job(self, job_data: Dict[str, Any]) -> None:
         """
@@ -192,10 +657,7 @@ class Storage:
             })
         """
         with self._get_connection() as conn:
-            conn.execute("""
-                INSERT INTO jobs (id, command, priority, state, attempts, max_retries, created_at, updated_at, next_retry_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
+            conn.execute(_INSERT_JOB_SQL, (
                 job_data['id'],
                 job_data['command'],
                 job_data.get('priority', 'medium'),
@@ -207,7 +669,64 @@ class Storage:
                 job_data.get('next_retry_at')
             ))
 
-    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+    def create_jobs_bulk(self, rows: List[Tuple]) -> int:
+        """
+        Save many new jobs in a single transaction.
+
+        One executemany() and one commit are issued for the whole batch,
+        so the commit cost is paid once instead of once per job. If any
+        row fails (e.g. duplicate ID), no jobs are saved.
+
+        Args:
+            rows: Tuples in column order, as produced by Job.to_row()
+                (id, command, priority, state, attempts, max_retries,
+                 created_at, updated_at, next_retry_at)
+
+        Returns:
+            Number of jobs inserted
+        """
+        with self._get_connection() as conn:
+            conn.executemany(_INSERT_JOB_SQL, rows)
+        return len(rows)
+
+    def create_jobs(self, jobs: List[Dict[str, Any]]) -> int:
+        """
+        Save many new jobs, given as dictionaries, in a single transaction.
+
+        Dictionary counterpart of create_jobs_bulk(): each job takes the
+        same keys and defaults as create_job().
+
+        Args:
+            jobs: List of job dictionaries (see create_job for the keys)
+
+        Returns:
+            Number of jobs inserted
+
+        Example:
+            storage.create_jobs([
+                {'id': 'a', 'command': 'echo a', 'state': 'pending',
+                 'created_at': now, 'updated_at': now},
+                {'id': 'b', 'command': 'echo b', 'state': 'pending',
+                 'created_at': now, 'updated_at': now},
+            ])
+        """
+        rows = [
+            (
+                job['id'],
+                job['command'],
+                job.get('priority', 'medium'),
+                job['state'],
+                job.get('attempts', 0),
+                job.get('max_retries', 3),
+                job['created_at'],
+                job['updated_at'],
+                job.get('next_retry_at')
+            )
+            for job in jobs
+        ]
+        return self.create_jobs_bulk(rows)
+
+    def get_job(self, job_id: str) -> Optional[sqlite3.Row]:
         """
         Retrieve a job from the database by its ID.
 
@@ -215,7 +734,8 @@ class Storage:
             job_id: The unique identifier of the job
 
         Returns:
-            Dictionary with job data if found, None if not found
+            Read-only sqlite3.Row with job data (indexable by column name)
+            if found, None if not found. Use dict(job) for a mutable copy.
 
         Example:
             job = storage.get_job('123')
@@ -231,12 +751,8 @@ class Storage:
                 WHERE id = ?
             """, (job_id,))
 
-            row = cursor.fetchone()
-
-            if row:
-                # Convert sqlite3.Row to dictionary
-                return dict(row)
-            return None
+            # sqlite3.Row already maps column names; no dict copy needed
+            return cursor.fetchone()
 
     def update_job(self, job_id: str, updates: Dict[str, Any]) -> bool:
         """
@@ -262,42 +778,142 @@ class Storage:
         if not updates:
             return False
 
-        # Build the SET clause dynamically based on provided fields
-        set_parts = []
-        values = []
+        now = utc_now_iso()
 
-        for key, value in updates.items():
-            set_parts.append(f"{key} = ?")
-            values.append(value)
+        # Keep the numeric priority in step with the label
+        if 'priority' in updates:
+            updates = {**updates, 'priority_int': PRIORITY_INT.get(updates['priority'], 2)}
 
-        # Always update the updated_at timestamp
-        from datetime import datetime, timezone
-        set_parts.append("updated_at = ?")
-        values.append(datetime.now(timezone.utc).isoformat())
+        # Build the SET clause once per distinct set of columns; callers pass
+        # the same keys in the same order, so the cached text is reused
+        keys = tuple(updates)
+        sql = self._update_stmt_cache.get(keys)
+        if sql is None:
+            set_clause = ', '.join(f"{key} = ?" for key in keys)
+            # Always update the updated_at timestamp
+            sql = f"UPDATE jobs SET {set_clause}, updated_at = ? WHERE id = ?"
+            self._update_stmt_cache[keys] = sql
 
-        # Add job_id as last parameter for WHERE clause
-        values.append(job_id)
-
-        sql = f"""
-            UPDATE jobs
-            SET {', '.join(set_parts)}
-            WHERE id = ?
-        """
+        values = [*updates.values(), now, job_id]
 
         with self._get_connection() as conn:
             cursor = conn.execute(sql, values)
             return cursor.rowcount > 0  # Returns True if at least one row was updated
 
-    def list_jobs(self, state: Optional[str] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    def _transition(self, name: str, *params) -> bool:
+        """
+        Run one of the fixed _JOB_TRANSITION_SQL statements.
+
+        Args:
+            name: Transition name (key of _JOB_TRANSITION_SQL)
+            *params: Statement parameters in order, ending with updated_at
+                and the job ID
+
+        Returns:
+            True if job was updated, False if not found
+        """
+        with self._get_connection() as conn:
+            return conn.execute(_JOB_TRANSITION_SQL[name], params).rowcount > 0
+
+    def mark_job_processing(self, job_id: str) -> bool:
+        """
+        Set a job's state to 'processing' (claims already do this themselves).
+
+        Returns:
+            True if job was updated, False if not found
+        """
+        return self._transition('processing', utc_now_iso(), job_id)
+
+    def complete_job(self, job_id: str) -> bool:
+        """
+        Mark a claimed job completed and release its lock in one statement.
+
+        Returns:
+            True if job was updated, False if not found
+        """
+        return self._transition('complete', utc_now_iso(), job_id)
+
+    def fail_job_retry(self, job_id: str, attempts: int, next_retry_at: float) -> bool:
+        """
+        Put a failed job back to 'pending' for a scheduled retry, unlocked.
+
+        Args:
+            job_id: The job ID to update
+            attempts: New attempt count
+            next_retry_at: Unix time (seconds) before which the job isn't claimable
+
+        Returns:
+            True if job was updated, False if not found
+        """
+        return self._transition('retry', attempts, next_retry_at, utc_now_iso(), job_id)
+
+    def fail_job_dlq(self, job_id: str, attempts: int) -> bool:
+        """
+        Move a job that ran out of retries to the Dead Letter Queue ('dead').
+
+        Args:
+            job_id: The job ID to update
+            attempts: Final attempt count
+
+        Returns:
+            True if job was updated, False if not found
+        """
+        return self._transition('dlq', attempts, utc_now_iso(), job_id)
+
+    def release_job(self, job_id: str) -> bool:
+        """
+        Hand a claimed job back to the queue unfinished: 'pending', unlocked,
+        attempts unchanged.
+
+        Returns:
+            True if job was updated, False if not found
+        """
+        return self._transition('release', utc_now_iso(), job_id)
+
+    def requeue_job(self, job_id: str) -> bool:
+        """
+        Move a job (e.g. from the DLQ) back to 'pending' with attempts reset to 0.
+
+        Returns:
+            True if job was updated, False if not found
+        """
+        return self._transition('requeue', utc_now_iso(), job_id)
+
+    def list_jobs(
+        self,
+        state: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        fields: Optional[List[str]] = None,
+        newest_first: bool = False,
+        as_jobs: bool = False
+    ) -> List[Any]:
         """
         List jobs from the database with optional filtering.
 
+        Filtering, paging and column selection are all done in SQL, so
+        only the requested rows and columns leave SQLite.
+
         Args:
             state: Optional filter by job state (e.g., 'pending', 'completed', 'failed')
             limit: Optional limit on number of jobs to return
+            offset: Optional number of jobs to skip before returning results
+            fields: Optional list of columns to return (subset of JOB_COLUMNS);
+                all columns are returned if omitted
+            newest_first: Order by most recently updated first instead of
+                creation order. Combined with a state filter this is served
+                by idx_jobs_state_updated without a separate sort step.
+            as_jobs: Return Job instances instead of dictionaries. The Job
+                columns are fetched as plain tuples and unpacked with
+                Job.from_row, skipping the dict conversion; fields is ignored.
 
         Returns:
-            List of job dictionaries (empty list if no jobs found)
+            List of read-only sqlite3.Row job rows (indexable by column
+            name, with keys() in selection order), or Job instances if
+            as_jobs is set (empty list if no jobs found)
+
+        Raises:
+            ValueError: If fields contains an unknown column name
 
         Example:
             # Get all jobs
@@ -308,9 +924,96 @@ class Storage:
 
             # Get first 10 completed jobs
             completed_jobs = storage.list_jobs(state='completed', limit=10)
+
+            # Get IDs of the second page of dead jobs
+            dead_ids = storage.list_jobs(state='dead', limit=10, offset=10, fields=['id'])
+        """
+        sql, params = self._list_jobs_query(state, limit, offset, fields, newest_first, as_jobs)
+
+        with self._get_connection() as conn:
+            if as_jobs:
+                # Plain tuples in slot order go straight into Job.from_row
+                cursor = self._tuple_cursor(conn).execute(sql, params)
+                return [Job.from_row(row) for row in cursor]
+
+            # sqlite3.Row rows are returned as-is, without per-row dict copies
+            return conn.execute(sql, params).fetchall()
+
+    def iter_jobs(
+        self,
+        state: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        fields: Optional[List[str]] = None,
+        newest_first: bool = False
+    ) -> Iterator[sqlite3.Row]:
+        """
+        Stream jobs from the database instead of building a list.
+
+        Takes the same filters as list_jobs() and yields sqlite3.Row rows as
+        SQLite produces them, so memory stays flat however many rows match.
+        Arguments are validated immediately, not on the first next().
+
+        Raises:
+            ValueError: If fields contains an unknown column name
+
+        Example:
+            for job in storage.iter_jobs(state='completed'):
+                print(job['id'])
+        """
+        sql, params = self._list_jobs_query(state, limit, offset, fields, newest_first)
+        return self._iter_rows(sql, params)
+
+    def list_job_ids(
+        self,
+        state: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None
+    ) -> List[str]:
         """
-        sql = """
-            SELECT id, command, priority, state, attempts, max_retries, created_at, updated_at, locked_by, locked_at, next_retry_at
+        List only job IDs, in creation order, with the filters of list_jobs().
+
+        Only the id column is read, and rows come back as plain tuples. The
+        creation order is walked from idx_jobs_created (or
+        idx_jobs_state_created when filtering by state), so no sort is needed.
+
+        Example:
+            # IDs of the first 100 pending jobs
+            ids = storage.list_job_ids(state='pending', limit=100)
+        """
+        sql, params = self._list_jobs_query(state, limit, offset, ['id'], False)
+        with self._get_connection() as conn:
+            cursor = self._tuple_cursor(conn).execute(sql, params)
+            return [row[0] for row in cursor]
+
+    def _iter_rows(self, sql: str, params: List[Any]) -> Iterator[sqlite3.Row]:
+        """Yield the rows of a read-only query from this thread's connection."""
+        with self._get_connection() as conn:
+            yield from conn.execute(sql, params)
+
+    @staticmethod
+    def _list_jobs_query(
+        state: Optional[str],
+        limit: Optional[int],
+        offset: Optional[int],
+        fields: Optional[List[str]],
+        newest_first: bool,
+        as_jobs: bool = False
+    ) -> Tuple[str, List[Any]]:
+        """Build the SELECT and its parameters for list_jobs() and iter_jobs()."""
+        # Column names can't be bound as parameters, so only allow known ones
+        if as_jobs:
+            columns = ', '.join(Job.__slots__)
+        elif fields:
+            unknown = [f for f in fields if f not in JOB_COLUMNS]
+            if unknown:
+                raise ValueError(f"Unknown job field(s): {', '.join(unknown)}")
+            columns = ', '.join(fields)
+        else:
+            columns = ', '.join(JOB_COLUMNS)
+
+        sql = f"""
+            SELECT {columns}
             FROM jobs
         """
         params = []
@@ -320,28 +1023,57 @@ class Storage:
             sql += " WHERE state = ?"
             params.append(state)
 
-        # Add ORDER BY to get jobs in creation order
-        sql += " ORDER BY created_at ASC"
+        if newest_first:
+            # Most recently updated first (walks idx_jobs_state_updated in order)
+            sql += " ORDER BY updated_at DESC"
+        else:
+            # Add ORDER BY to get jobs in creation order (rowid breaks timestamp ties)
+            sql += " ORDER BY created_at ASC, rowid ASC"
 
-        # Add LIMIT clause if specified
-        if limit:
+        # Add LIMIT/OFFSET clauses if specified (SQLite needs a LIMIT for OFFSET; -1 = no limit)
+        if limit or offset:
             sql += " LIMIT ?"
-            params.append(limit)
+            params.append(limit if limit else -1)
+        if offset:
+            sql += " OFFSET ?"
+            params.append(offset)
 
-        with self._get_connection() as conn:
-            cursor = conn.execute(sql, params)
-            rows = cursor.fetchall()
+        return sql, params
 
-            # Convert all rows to dictionaries
-            return [dict(row) for row in rows]
+    def find_stale_locks(self, older_than_iso: str) -> List[sqlite3.Row]:
+        """
+        Find jobs locked by a worker since before a given time.
+
+        A job stays locked while a worker runs it, so a lock much older than
+        the longest expected run usually means the worker died mid-job. Only
+        the small idx_jobs_locked partial index is searched.
+
+        Args:
+            older_than_iso: ISO 8601 UTC timestamp; locks taken before it are stale
+
+        Returns:
+            List of job rows (oldest lock first)
+
+        Example:
+            stale = storage.find_stale_locks(utc_now_iso(-600))  # locked > 10 min ago
+        """
+        with self._get_connection() as conn:
+            return conn.execute(f"""
+                SELECT {', '.join(JOB_COLUMNS)}
+                FROM jobs
+                WHERE locked_by IS NOT NULL
+                  AND locked_at < ?
+                ORDER BY locked_at ASC
+            """, (older_than_iso,)).fetchall()
 
     def claim_next_job(self, worker_id: str) -> Optional[Dict[str, Any]]:
         """
         Atomically claim the next pending job for a worker.
 
         PRODUCTION-GRADE: Race condition safe with exponential backoff!
-        Uses database transactions to ensure only ONE worker claims each job.
-        Only claims jobs that are ready to be retried (next_retry_at has passed).
+        Uses a single UPDATE ... RETURNING statement so only ONE worker
+        claims each job. Only claims jobs that are ready to be retried
+        (next_retry_at has passed).
 
         Args:
             worker_id: Unique identifier for the worker claiming the job
@@ -350,11 +1082,16 @@ class Storage:
             Job dictionary if claimed, None if no jobs available
 
         How it works:
-            1. Start a transaction with BEGIN IMMEDIATE (locks database)
-            2. Find first pending job that is NOT locked and ready for retry
-            3. Atomically update it with worker_id and lock timestamp
-            4. Return the job to the worker
-            5. If another worker already claimed it, this returns None
+            0. A read-only probe returns early when nothing is claimable, so
+               idle workers never take the write lock
+            1. One UPDATE picks the first pending, unlocked, retry-ready job
+               (by priority, then creation order) in a subquery
+            2. The same statement locks it with worker_id and a timestamp
+            3. RETURNING hands back the claimed row, already updated
+            4. SQLite serializes writers, so two workers can never claim the
+               same row; busy_timeout makes the loser wait, not fail
+            On SQLite older than 3.35 (no RETURNING) the compare-and-swap
+            loop in _claim_next_job_select is used instead.
 
         Example:
             job = storage.claim_next_job('worker-1')
@@ -363,68 +1100,168 @@ class Storage:
             else:
                 print("No jobs available")
         """
-        from datetime import datetime, timezone
+        if not _HAS_RETURNING:
+            return self._claim_next_job_select(worker_id)
 
+        now = utc_now_iso()
         with self._get_connection() as conn:
-            # Start an immediate transaction - locks the database
-            conn.execute("BEGIN IMMEDIATE")
-
-            try:
-                # Get current time for retry check
-                now = datetime.now(timezone.utc).isoformat()
-
-                # Find first pending job that isn't locked and is ready for retry
-                # Order by priority (high > medium > low) then by creation time
-                cursor = conn.execute("""
-                    SELECT id, command, priority, state, attempts, max_retries, created_at, updated_at, locked_by, locked_at, next_retry_at
-                    FROM jobs
+            if not self._has_claimable_job(conn):
+                return None
+            row = self._tuple_cursor(conn).execute("""
+                UPDATE jobs
+                SET state = 'processing',
+                    locked_by = ?,
+                    locked_at = ?,
+                    updated_at = ?
+                WHERE id = (
+                    SELECT id
+                    FROM jobs INDEXED BY idx_claim_order
                     WHERE state = 'pending'
                       AND locked_by IS NULL
                       AND (next_retry_at IS NULL OR next_retry_at <= ?)
                     ORDER BY
-                        CASE priority
-                            WHEN 'high' THEN 1
-                            WHEN 'medium' THEN 2
-                            WHEN 'low' THEN 3
-                            ELSE 2
-                        END ASC,
-                        created_at ASC
+                        priority_int DESC,
+                        created_at ASC,
+                        rowid ASC  -- insertion order for jobs sharing a timestamp (batches)
                     LIMIT 1
-                """, (now,))
+                )
+                  -- CAS guard: the row must still be unclaimed when it is updated
+                  AND state = 'pending'
+                  AND locked_by IS NULL
+                RETURNING id, command, priority, state, attempts, max_retries, created_at, updated_at, locked_by, locked_at, next_retry_at
+            """, (worker_id, now, now, time.time())).fetchone()
+
+        # Plain tuple zipped with the known column order: no Row object per claim
+        return dict(zip(JOB_COLUMNS, row)) if row else None
+
+    @staticmethod
+    def _has_claimable_job(conn: sqlite3.Connection) -> bool:
+        """
+        Whether any job is claimable right now, checked without a write lock.
 
-                row = cursor.fetchone()
+        An UPDATE takes SQLite's single write lock even when it matches no
+        rows, so N idle workers polling an empty queue would queue up behind
+        each other and behind real writers. This probe is a plain WAL read.
+        A True answer can still lose the race to another worker; the claim
+        UPDATE itself stays the source of truth.
+        """
+        return conn.execute(_CLAIMABLE_EXISTS_SQL, (time.time(),)).fetchone() is not None
 
-                if not row:
-                    # No jobs available
-                    conn.commit()
-                    return None
+    def claim_next_jobs(self, worker_id: str, batch_size: int) -> List[Dict[str, Any]]:
+        """
+        Atomically claim up to batch_size pending jobs in one statement.
 
-                job = dict(row)
+        Same selection rules as claim_next_job (pending, unlocked, retry-ready,
+        by priority then creation order), but one UPDATE ... RETURNING and one
+        commit lock a whole batch. RETURNING doesn't preserve the subquery's
+        order, so the rows are re-sorted into claim order here.
 
-                # Atomically claim the job by updating lock fields
-                now = datetime.now(timezone.utc).isoformat()
-                conn.execute("""
-                    UPDATE jobs
-                    SET state = 'processing',
-                        locked_by = ?,
-                        locked_at = ?,
-                        updated_at = ?
-                    WHERE id = ?
-                """, (worker_id, now, now, job['id']))
+        Args:
+            worker_id: Unique identifier for the worker claiming the jobs
+            batch_size: Maximum number of jobs to claim
 
-                conn.commit()
+        Returns:
+            List of claimed job dictionaries in processing order (may be empty)
+        """
+        if not _HAS_RETURNING or batch_size <= 1:
+            job = self.claim_next_job(worker_id)
+            return [job] if job else []
 
-                # Update the job dict with new values
-                job['state'] = 'processing'
-                job['locked_by'] = worker_id
-                job['locked_at'] = now
-                job['updated_at'] = now
+        now = utc_now_iso()
+        with self._get_connection() as conn:
+            if not self._has_claimable_job(conn):
+                return []
+            rows = self._tuple_cursor(conn).execute("""
+                UPDATE jobs
+                SET state = 'processing',
+                    locked_by = ?,
+                    locked_at = ?,
+                    updated_at = ?
+                WHERE id IN (
+                    SELECT id
+                    FROM jobs INDEXED BY idx_claim_order
+                    WHERE state = 'pending'
+                      AND locked_by IS NULL
+                      AND (next_retry_at IS NULL OR next_retry_at <= ?)
+                    ORDER BY
+                        priority_int DESC,
+                        created_at ASC,
+                        rowid ASC
+                    LIMIT ?
+                )
+                RETURNING priority_int, rowid,
+                          id, command, priority, state, attempts, max_retries, created_at, updated_at, locked_by, locked_at, next_retry_at
+            """, (worker_id, now, now, time.time(), batch_size)).fetchall()
+
+        # Sort on (priority_int desc, created_at, rowid), then drop the two sort keys
+        rows.sort(key=lambda row: (-row[0], row[8], row[1]))
+        return [dict(zip(JOB_COLUMNS, row[2:])) for row in rows]
+
+    def _claim_next_job_select(self, worker_id: str) -> Optional[Dict[str, Any]]:
+        """
+        claim_next_job for SQLite builds without UPDATE ... RETURNING.
+
+        Optimistic compare-and-swap claim, no BEGIN IMMEDIATE: read a few
+        candidate ids without taking the write lock, then try to lock each
+        with an UPDATE guarded by "still pending and unlocked". rowcount == 1
+        means we won the row; 0 means another worker got there first, so move
+        on to the next candidate. Workers only hold the write lock for the
+        single-row UPDATE, never across the SELECT.
+        """
+        with self._get_connection() as conn:
+            cursor = self._tuple_cursor(conn)
 
-                return job
+            while True:
+                now = utc_now_iso()
 
-            except Exception:
-                conn.rollback()
-                raise
+                # Candidate jobs, first in claim order; no lock taken yet.
+                # Whole rows are read so a won claim needs no second SELECT
+                candidates = cursor.execute("""
+                    SELECT id, command, priority, state, attempts, max_retries, created_at, updated_at, locked_by, locked_at, next_retry_at
+                    FROM jobs INDEXED BY idx_claim_order
+                    WHERE state = 'pending'
+                      AND locked_by IS NULL
+                      AND (next_retry_at IS NULL OR next_retry_at <= ?)
+                    ORDER BY
+                        priority_int DESC,
+                        created_at ASC,
+                        rowid ASC  -- insertion order for jobs sharing a timestamp (batches)
+                    LIMIT ?
+                """, (time.time(), _CLAIM_CANDIDATES)).fetchall()
+
+                if not candidates:
+                    # No jobs available
+                    return None
+
+                for row in candidates:
+                    # CAS: only succeeds if nobody touched this job since the
+                    # SELECT. Every write bumps updated_at, so it doubles as a
+                    # row version (a job claimed, failed and re-queued in
+                    # between is 'pending' again but no longer matches)
+                    claimed = cursor.execute("""
+                        UPDATE jobs
+                        SET state = 'processing',
+                            locked_by = ?,
+                            locked_at = ?,
+                            updated_at = ?
+                        WHERE id = ?
+                          AND state = 'pending'
+                          AND locked_by IS NULL
+                          AND updated_at = ?
+                    """, (worker_id, now, now, row[0], row[7])).rowcount == 1
+                    conn.commit()
+
+                    if claimed:
+                        # The CAS proved the row is unchanged since the SELECT,
+                        # so apply our own update to the row we already have
+                        job = dict(zip(JOB_COLUMNS, row))
+                        job['state'] = 'processing'
+                        job['locked_by'] = worker_id
+                        job['locked_at'] = now
+                        job['updated_at'] = now
+                        return job
+
+                # Every candidate was taken by other workers; look again
 
     def set_config(self, key: str, value: str) -> None:
         """
@@ -439,11 +1276,14 @@ class Storage:
             storage.set_config('backoff-base', '2')
         """
         with self._get_connection() as conn:
-            # Use INSERT OR REPLACE to update existing or insert new
+            # Use INSERT OR REPLACE to update existing or insert new. The
+            # config row has no other columns to lose, and unlike
+            # ON CONFLICT ... DO UPDATE (SQLite 3.24+) it runs on any SQLite
             conn.execute("""
                 INSERT OR REPLACE INTO config (key, value)
                 VALUES (?, ?)
             """, (key, value))
+        self._config_cache[key] = value
 
     def get_config(self, key: str, default: Optional[str] = None) -> Optional[str]:
         """
@@ -456,21 +1296,36 @@ class Storage:
         Returns:
             Configuration value if found, default otherwise
 
+        Values (and misses) are cached on this instance for up to
+        CONFIG_CACHE_TTL seconds; set_config updates the cache directly.
+        This is the only config cache: the CLI and workers read through it
+        rather than keeping values of their own, so a change made by another
+        process is seen by every reader within the TTL.
+
         Example:
             max_retries = storage.get_config('max-retries', '3')
             backoff_base = storage.get_config('backoff-base', '2')
         """
-        with self._get_connection() as conn:
-            cursor = conn.execute("""
-                SELECT value FROM config
-                WHERE key = ?
-            """, (key,))
-
-            row = cursor.fetchone()
-
-            if row:
-                return row['value']
-            return default
+        cache = self._config_cache_for_read()
+        if key in cache:
+            value = cache[key]
+        else:
+            with self._get_connection() as conn:
+                row = conn.execute("""
+                    SELECT value FROM config
+                    WHERE key = ?
+                """, (key,)).fetchone()
+            value = cache[key] = row['value'] if row else None
+
+        return default if value is None else value
+
+    def _config_cache_for_read(self) -> Dict[str, Optional[str]]:
+        """Return the config cache, emptied first if its TTL has run out."""
+        now = time.monotonic()
+        if now >= self._config_cache_expires:
+            self._config_cache.clear()
+            self._config_cache_expires = now + CONFIG_CACHE_TTL
+        return self._config_cache
 
     def list_config(self) -> Dict[str, str]:
         """
@@ -488,7 +1343,14 @@ class Storage:
             cursor = conn.execute("SELECT key, value FROM config ORDER BY key")
             rows = cursor.fetchall()
 
-            return {row['key']: row['value'] for row in rows}
+        config = {row['key']: row['value'] for row in rows}
+
+        # A full read is the freshest view: replace the cache with it
+        self._config_cache.clear()
+        self._config_cache.update(config)
+        self._config_cache_expires = time.monotonic() + CONFIG_CACHE_TTL
+
+        return config
 
     def get_job_counts(self) -> Dict[str, int]:
         """
@@ -498,29 +1360,35 @@ class Storage:
             Dictionary mapping state to count
             Example: {'pending': 5, 'processing': 2, 'completed': 100, 'failed': 3, 'dead': 1}
         """
+        # One pass over a covering state index; each state is summed in its
+        # own column, so every state comes back with 0 or more
         with self._get_connection() as conn:
-            cursor = conn.execute("""
-                SELECT state, COUNT(*) as count
-                FROM jobs
-                GROUP BY state
-                ORDER BY state
-            """)
-            rows = cursor.fetchall()
+            row = conn.execute(_JOB_COUNTS_SQL).fetchone()
+            return dict(zip(JOB_STATES, row))
 
-            # Create dict with all states initialized to 0
-            counts = {
-                'pending': 0,
-                'processing': 0,
-                'completed': 0,
-                'failed': 0,
-                'dead': 0
-            }
+    def count_by_state(self, state: str) -> int:
+        """
+        Count the jobs in a single state.
 
-            # Update with actual counts
-            for row in rows:
-                counts[row['state']] = row['count']
+        Cheaper than get_job_counts() when only one state matters: the
+        count walks just that state's range of idx_jobs_state_created and
+        never reads table rows.
 
-            return counts
+        Args:
+            state: Job state to count (e.g., 'pending')
+
+        Returns:
+            Number of jobs in that state
+
+        Example:
+            backlog = storage.count_by_state('pending')
+        """
+        with self._get_connection() as conn:
+            return conn.execute("""
+                SELECT COUNT(*)
+                FROM jobs INDEXED BY idx_jobs_state_created
+                WHERE state = ?
+            """, (state,)).fetchone()[0]
 
     def get_priority_counts(self) -> Dict[str, int]:
         """
@@ -560,3 +1428,24 @@ class Storage:
                     counts[priority] = row['count']
 
             return counts
+
+    def get_state_priority_counts(self) -> Dict[Tuple[str, Optional[str]], int]:
+        """
+        Get count of jobs grouped by state and priority in a single query.
+
+        Both the per-state and per-priority totals shown by `status` can be
+        derived from this, so the table (or rather the covering
+        idx_jobs_state_priority index) is scanned once instead of twice.
+
+        Returns:
+            Dictionary mapping (state, priority) to count
+            Example: {('pending', 'high'): 2, ('completed', 'medium'): 40}
+        """
+        with self._get_connection() as conn:
+            cursor = conn.execute("""
+                SELECT state, priority, COUNT(*) as count
+                FROM jobs
+                GROUP BY state, priority
+            """)
+
+            return {(row['state'], row['priority']): row['count'] for row in cursor}
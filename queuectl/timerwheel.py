@@ -0,0 +1,117 @@
+"""
+Hashed timing wheel for scheduling retry wakeups.
+"""
+import bisect
+import itertools
+import math
+import time
+from typing import Any, Callable, List, Optional
+
+
+class HashedTimerWheel:
+    """
+    Timer facility with O(1) bucket selection, independent of backlog size.
+
+    Time is cut into ticks of `tick` seconds, and a deadline lands in bucket
+    (deadline_tick % wheel_size). Each bucket keeps its entries sorted by
+    deadline (Varghese & Lauck, scheme 5), so entries more than one
+    revolution away simply sit behind the ones that are due.
+
+    Timers fire at tick granularity and never early: an entry is reported
+    by pop_due() on the first tick at or after its deadline.
+
+    Example:
+        wheel = HashedTimerWheel()
+        wheel.schedule('job-1', 2.0)
+        wheel.time_until_next()   # ~2.0
+        wheel.pop_due()           # ['job-1'] once 2 seconds have passed
+    """
+
+    def __init__(
+        self,
+        tick: float = 0.1,
+        wheel_size: int = 512,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Args:
+            tick: Timer resolution in seconds
+            wheel_size: Number of buckets (one revolution = tick * wheel_size)
+            clock: Monotonic time source, in seconds
+        """
+        self.tick = tick
+        self.wheel_size = wheel_size
+        self._clock = clock
+        self._origin = clock()
+        self._buckets: List[list] = [[] for _ in range(wheel_size)]
+        self._cursor = 0            # First tick whose bucket hasn't been expired
+        self._count = 0
+        self._seq = itertools.count()  # Tie-breaker: keys never get compared
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _current_tick(self) -> int:
+        # Same epsilon as schedule(): at exactly a deadline's time, the tick
+        # must already be the deadline tick (100.3 / 0.1 == 1002.9999999999999)
+        return int((self._clock() - self._origin) / self.tick + 1e-9)
+
+    def schedule(self, key: Any, delay: float) -> None:
+        """
+        Schedule key to become due after delay seconds.
+
+        Args:
+            key: Value returned by pop_due() once due (e.g. a job ID)
+            delay: Seconds from now
+        """
+        # The epsilon keeps float noise (2.0 / 0.1 == 20.000000000000004)
+        # from pushing an exact multiple of tick into the next tick
+        deadline = math.ceil((self._clock() - self._origin + delay) / self.tick - 1e-9)
+        deadline = max(deadline, self._cursor)
+        bucket = self._buckets[deadline % self.wheel_size]
+        bisect.insort(bucket, (deadline, next(self._seq), key))
+        self._count += 1
+
+    def pop_due(self) -> List[Any]:
+        """
+        Remove and return every key whose deadline has passed, earliest first.
+        """
+        now_tick = self._current_tick()
+        due = []
+        if self._count:
+            # Visit each tick since the last call, but never more than one
+            # revolution: by then every bucket has been looked at once
+            last = min(now_tick, self._cursor + self.wheel_size - 1)
+            for tick in range(self._cursor, last + 1):
+                bucket = self._buckets[tick % self.wheel_size]
+                while bucket and bucket[0][0] <= now_tick:
+                    due.append(bucket.pop(0))
+            self._count -= len(due)
+            due.sort()
+        self._cursor = max(self._cursor, now_tick + 1)
+        return [key for _, _, key in due]
+
+    def time_until_next(self) -> Optional[float]:
+        """
+        Seconds until the earliest scheduled key is due (0 if already due).
+
+        Returns:
+            Seconds to wait, or None if nothing is scheduled
+        """
+        if not self._count:
+            return None
+
+        deadline = None
+        # Within one revolution, the first bucket whose head belongs to its
+        # own tick holds the earliest deadline
+        for tick in range(self._cursor, self._cursor + self.wheel_size):
+            bucket = self._buckets[tick % self.wheel_size]
+            if bucket and bucket[0][0] <= tick:
+                deadline = bucket[0][0]
+                break
+        else:
+            # Everything is more than a revolution out: take the smallest head
+            deadline = min(bucket[0][0] for bucket in self._buckets if bucket)
+
+        wait = self._origin + deadline * self.tick - self._clock()
+        return max(0.0, wait)
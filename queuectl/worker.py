@@ -1,20 +1,83 @@
 """
 Worker process logic for executing jobs from the queue.
 """
+import asyncio
+import os
+import shlex
+import shutil
 import subprocess
+import sys
 import time
 import signal
-import sys
-from typing import Optional, Dict, Any
+from collections import deque
+from functools import lru_cache
+from typing import Optional, Dict, Any, List, Tuple
+from urllib.parse import quote
 from queuectl.storage import Storage
+from queuectl.timerwheel import HashedTimerWheel
+
+
+# Longest an idle worker waits before re-checking the queue without a wakeup
+IDLE_POLL_INTERVAL = 1.0
+
+# Characters that need /bin/sh to interpret (pipes, redirects, expansion,
+# globbing, quoting subtleties, comments, multiple lines)
+_SHELL_METACHARS = frozenset('|&;<>()$`\\*?[]{}~!#\n')
+
+# Shell builtins and keywords: no executable to run without a shell
+_SHELL_BUILTINS = frozenset((
+    'exit', 'cd', 'export', 'unset', 'set', 'source', '.', 'eval', 'exec',
+    'alias', 'ulimit', 'umask', 'wait', 'trap', 'return', 'shift', 'read',
+    'if', 'for', 'while', 'until', 'case', 'function',
+))
+
+
+@lru_cache(maxsize=64)
+def _backoff_delay(initial_delay: str, backoff_base: str, attempts: int) -> int:
+    """
+    Retry delay in seconds: initial_delay * (backoff_base ^ attempts).
+
+    Takes the raw config strings so repeated failures under the same
+    configuration hit the cache instead of re-parsing and re-computing.
+    """
+    return int(initial_delay) * (int(backoff_base) ** attempts)
+
+
+# PATH lookups are a stat() per PATH entry; repeated jobs run the same few
+# programs, so resolve each name once per worker
+_resolve_program = lru_cache(maxsize=256)(shutil.which)
+
+
+def _split_plain_command(command: str) -> Optional[Tuple[str, List[str]]]:
+    """
+    Split a command into an argv list if it can safely run without a shell.
+
+    Returns (absolute program path, argv), or None when the command uses any
+    shell feature (metacharacters, builtins, VAR=value prefixes) or its
+    program isn't on PATH, so the caller falls back to shell=True and keeps
+    the shell's exact behaviour (including its 127 "not found" exit code).
+    """
+    if any(c in _SHELL_METACHARS for c in command):
+        return None
+    try:
+        argv = shlex.split(command)
+    except ValueError:
+        return None  # Unbalanced quotes: let the shell report it
+    if not argv or argv[0] in _SHELL_BUILTINS or '=' in argv[0]:
+        return None
+    executable = _resolve_program(argv[0])
+    if executable is None:
+        return None
+    return os.path.abspath(executable), argv
 
 
 class Worker:
     """
     Worker that processes jobs from the queue.
 
-    The worker continuously polls the database for pending jobs,
-    executes their commands, and updates their state based on results.
+    The worker claims pending jobs from the database, executes their
+    commands, and updates their state based on results. While idle it
+    blocks until a job is enqueued (or a retry becomes due).
     """
 
     def __init__(self, worker_id: str = "worker-1"):
@@ -27,6 +90,14 @@ class Worker:
         self.worker_id = worker_id
         self.storage = Storage()
         self.running = True  # Flag to control worker loop
+        # Self-pipe the signal handler writes to, so a shutdown wakes an idle
+        # wait_for_job() at once: (read fd, write fd), made by run()
+        self._wakeup_fds = None
+        # Jobs claimed in a batch (claim-batch-size > 1) but not yet started
+        self._job_buffer = deque()
+        # Retries this worker scheduled, so it wakes right when one is due
+        self.retry_wheel = HashedTimerWheel()
+        self._log_dirs_ready = set()  # log-dir values already created
 
         print(f"Worker {self.worker_id} initialized")
 
@@ -40,18 +111,50 @@ class Worker:
         Returns:
             Job dictionary if claimed, None if no pending jobs
         """
-        # Use atomic claim_next_job for race-condition-free claiming
+        # Serve jobs already claimed in an earlier batch first
+        if self._job_buffer:
+            return self._job_buffer.popleft()
+
+        # Use atomic claiming for race-condition-free claiming
         # This ensures only ONE worker gets each job, even with multiple workers
-        return self.storage.claim_next_job(self.worker_id)
+        batch_size = self.claim_batch_size()
+        if batch_size <= 1:
+            return self.storage.claim_next_job(self.worker_id)
+
+        # Claim several jobs in one round trip and buffer the rest
+        self._job_buffer.extend(self.storage.claim_next_jobs(self.worker_id, batch_size))
+        return self._job_buffer.popleft() if self._job_buffer else None
+
+    def claim_batch_size(self) -> int:
+        """
+        Number of jobs to claim per database round trip ('claim-batch-size').
+
+        Defaults to 1: each job is claimed right before it runs, so priority
+        order holds across workers. Larger values cut claim round trips for
+        high-throughput queues of short jobs, at the cost of this worker
+        holding (showing as 'processing') up to that many jobs at once.
+        """
+        try:
+            return max(1, int(self.storage.get_config('claim-batch-size', '1')))
+        except ValueError:
+            return 1
+
+    def release_buffered_jobs(self) -> None:
+        """Hand every claimed-but-unstarted job back to the queue."""
+        while self._job_buffer:
+            self.release_job(self._job_buffer.popleft()['id'])
 
     def mark_as_processing(self, job_id: str) -> None:
         """
         Mark a job as currently being processed.
 
+        Not used by run(): claim_next_job already sets state='processing'
+        in the claiming statement.
+
         Args:
             job_id: The job ID to update
         """
-        self.storage.update_job(job_id, {'state': 'processing'})
+        self.storage.mark_job_processing(job_id)
 
     def mark_as_completed(self, job_id: str) -> None:
         """
@@ -60,11 +163,23 @@ class Worker:
         Args:
             job_id: The job ID to update
         """
-        self.storage.update_job(job_id, {
-            'state': 'completed',
-            'locked_by': None,  # Clear lock
-            'locked_at': None   # Clear lock timestamp
-        })
+        # Dedicated single statement: state, lock and updated_at in one write
+        self.storage.complete_job(job_id)
+
+    def release_job(self, job_id: str) -> None:
+        """
+        Return a claimed job to the queue unfinished (back to 'pending', unlocked).
+
+        Used when the worker hits an unexpected error while holding a job,
+        so another worker can pick it up.
+
+        Args:
+            job_id: The job ID to release
+        """
+        try:
+            self.storage.release_job(job_id)
+        except Exception:
+            pass  # Nothing more we can do; the job's lock stays visible as stale
 
     def should_retry(self, attempts: int, max_retries: int) -> bool:
         """
@@ -102,48 +217,36 @@ class Worker:
             attempts: Current number of attempts (will be incremented)
             max_retries: Maximum retry attempts allowed
         """
-        from datetime import datetime, timezone, timedelta
-
         new_attempts = attempts + 1
 
         # Decide: Retry or DLQ?
         if self.should_retry(new_attempts, max_retries):
             # Still have retries left - set back to pending for retry
-            new_state = 'pending'
-
             # Calculate exponential backoff delay
             # Formula: delay = initial_delay * (base ^ attempts) seconds
-            backoff_base = int(self.storage.get_config('backoff-base', '2'))
-            initial_delay = int(self.storage.get_config('backoff-initial-delay', '1'))
-            delay_seconds = initial_delay * (backoff_base ** new_attempts)
+            # (get_config is served from Storage's config cache, no query)
+            delay_seconds = _backoff_delay(
+                self.storage.get_config('backoff-initial-delay', '1'),
+                self.storage.get_config('backoff-base', '2'),
+                new_attempts
+            )
 
-            # Calculate next retry time
-            next_retry_at = datetime.now(timezone.utc) + timedelta(seconds=delay_seconds)
+            # Calculate next retry time (unix seconds: plain float arithmetic)
+            next_retry_at = time.time() + delay_seconds
 
             print(f"  → Job will retry (attempt {new_attempts}/{max_retries})")
-            print(f"  → Retry scheduled in {delay_seconds} seconds (at {next_retry_at.strftime('%H:%M:%S')})")
-
-            # Update with retry scheduling
-            self.storage.update_job(job_id, {
-                'state': new_state,
-                'attempts': new_attempts,
-                'next_retry_at': next_retry_at.isoformat(),
-                'locked_by': None,   # Release the lock
-                'locked_at': None    # Clear lock timestamp
-            })
+            print(f"  → Retry scheduled in {delay_seconds} seconds "
+                  f"(at {time.strftime('%H:%M:%S', time.gmtime(next_retry_at))})")
+            self.retry_wheel.schedule(job_id, delay_seconds)
+
+            # Back to pending with retry scheduling, lock released
+            self.storage.fail_job_retry(job_id, new_attempts, next_retry_at)
         else:
             # Out of retries - send to Dead Letter Queue
-            new_state = 'dead'
             print(f"  → Job sent to DLQ (max retries {max_retries} exceeded)")
 
-            # Update to DLQ (no retry scheduling needed)
-            self.storage.update_job(job_id, {
-                'state': new_state,
-                'attempts': new_attempts,
-                'next_retry_at': None,
-                'locked_by': None,   # Release the lock
-                'locked_at': None    # Clear lock timestamp
-            })
+            # Update to DLQ (no retry scheduling needed), lock released
+            self.storage.fail_job_dlq(job_id, new_attempts)
 
     def execute_command(self, command: str, job_id: str) -> int:
         """
@@ -162,15 +265,23 @@ class Worker:
         """
         print(f"[{job_id}] Executing command: {command}")
 
+        # Simple commands run directly from an argv list (one exec, no
+        # shell); anything using shell syntax goes through /bin/sh
+        plain = _split_plain_command(command)
+
         try:
-            # Execute the command using subprocess.run()
-            result = subprocess.run(
-                command,
-                shell=True,              # Allow shell syntax (pipes, redirects, etc.)
-                capture_output=True,     # Capture stdout and stderr
-                text=True,               # Return output as string (not bytes)
-                timeout=300              # 5 minute timeout (can be configured later)
-            )
+            # Inside the try: an unusable log-dir fails this job attempt
+            # (and counts towards its retries) instead of escaping the loop
+            log_paths = self.job_log_paths(job_id)
+            if log_paths is None:
+                result = self._run_command(command, plain)
+            else:
+                # Stream output straight into the job's log files: no pipes,
+                # no reads or decoding here, constant memory whatever the size.
+                # Appended, so a retry doesn't wipe earlier attempts' output
+                with open(log_paths[0], 'ab') as out, open(log_paths[1], 'ab') as err:
+                    result = self._run_command(command, plain, out, err)
+                print(f"[{job_id}] Output logged to {log_paths[0]}, {log_paths[1]}")
 
             # Log the output
             if result.stdout:
@@ -190,26 +301,96 @@ class Worker:
             print(f"[{job_id}] ERROR: Failed to execute command: {e}")
             return 1  # Generic failure exit code
 
+    def job_log_paths(self, job_id: str) -> Optional[Tuple[str, str]]:
+        """
+        Paths of a job's stdout/stderr log files, if 'log-dir' is configured.
+
+        The job ID is percent-encoded into the file name, so every ID maps
+        to its own file inside log-dir (`a/b` and `a_b` don't collide).
+
+        Returns:
+            (stdout path, stderr path) under log-dir, or None to capture the
+            output and print it in the worker log (the default)
+
+        Raises:
+            OSError: If log-dir can't be created
+        """
+        log_dir = self.storage.get_config('log-dir', '')
+        if not log_dir:
+            return None
+        if log_dir not in self._log_dirs_ready:
+            os.makedirs(log_dir, exist_ok=True)
+            self._log_dirs_ready.add(log_dir)
+        base = os.path.join(log_dir, quote(job_id, safe=''))
+        return base + '.out', base + '.err'
+
+    @classmethod
+    def _run_command(cls, command: str, plain: Optional[Tuple[str, List[str]]],
+                     stdout=None, stderr=None):
+        """
+        Run a job command, retrying through the shell if a cached path is stale.
+        """
+        try:
+            return cls._spawn(command, plain, stdout, stderr)
+        except FileNotFoundError:
+            if plain is None:
+                raise
+            # Cached program path went stale (binary moved or removed):
+            # forget it and let the shell resolve and report it
+            _resolve_program.cache_clear()
+            return cls._spawn(command, None, stdout, stderr)
+
+    @staticmethod
+    def _spawn(command: str, plain: Optional[Tuple[str, List[str]]],
+               stdout=None, stderr=None):
+        """
+        Run a job command to completion, directly or through /bin/sh.
+
+        Plain commands are started from their already-resolved program path,
+        so the child's exec doesn't search PATH again. Output goes to the
+        given files, or is captured as text when none are given.
+        """
+        executable, args = (None, command) if plain is None else plain
+        if stdout is None:
+            streams = {'capture_output': True, 'text': True}  # Capture stdout and stderr as strings
+        else:
+            streams = {'stdout': stdout, 'stderr': stderr}     # Child writes the files directly
+        return subprocess.run(
+            args,
+            executable=executable,
+            shell=plain is None,     # Allow shell syntax (pipes, redirects, etc.)
+            timeout=300,             # 5 minute timeout (can be configured later)
+            **streams
+        )
+
     def run(self) -> None:
         """
         Main worker loop.
 
         Continuously processes jobs until stopped.
-        Polls the database for pending jobs every second.
+        When the queue is empty, it waits on the storage wakeup pipe until a
+        job is enqueued, re-checking at least every IDLE_POLL_INTERVAL
+        seconds (sooner if a scheduled retry is due).
         """
         # Set up signal handlers for graceful shutdown
+        self._wakeup_fds = os.pipe()
+        for fd in self._wakeup_fds:
+            os.set_blocking(fd, False)
         self.setup_signal_handlers()
+        self.buffer_output()
 
         print(f"Worker {self.worker_id} started. Waiting for jobs...")
         print("Press Ctrl+C to stop gracefully.\n")
 
         while self.running:
+            held_job_id = None  # Set while we hold a claimed, unfinished job
             try:
                 # Step 1: Atomically claim next pending job
                 # This uses database locking - safe with multiple workers!
                 job = self.get_next_pending_job()
 
                 if job:
+                    held_job_id = job['id']
                     # Job is now locked by us (state='processing', locked_by=worker_id)
                     print(f"→ [{self.worker_id}] Claimed job: {job['id']}")
 
@@ -220,16 +401,26 @@ class Worker:
                     if exit_code == 0:
                         # Success!
                         self.mark_as_completed(job['id'])
+                        held_job_id = None
                         print(f"✓ [{self.worker_id}] Job {job['id']} completed successfully\n")
                     else:
                         # Failed!
                         self.mark_as_failed(job['id'], job['attempts'], job['max_retries'])
+                        held_job_id = None
                         print(f"✗ [{self.worker_id}] Job {job['id']} failed with exit code {exit_code}")
                         print()  # Blank line for readability
 
+                    # Everything this job printed goes out in one write
+                    sys.stdout.flush()
+
                 else:
-                    # No jobs available - wait before polling again
-                    time.sleep(1)  # Poll every 1 second
+                    # No jobs available - sleep until an enqueue wakes us,
+                    # or until the next retry is due (polling is the safety net).
+                    # Flush first so nothing printed sits in the buffer while idle
+                    sys.stdout.flush()
+                    self.storage.wait_for_job(
+                        self.idle_timeout(), interrupt_fd=self._wakeup_fds[0]
+                    )
 
             except KeyboardInterrupt:
                 # User pressed Ctrl+C
@@ -238,12 +429,282 @@ class Worker:
                 break
 
             except Exception as e:
+                # Hand a claimed job back first: the error may be in our own
+                # logging (e.g. a closed stdout), and the job must not stay
+                # stuck in 'processing' if this worker can't carry on
+                if held_job_id is not None:
+                    self.release_job(held_job_id)
+
                 # Handle unexpected errors without crashing
                 print(f"ERROR: Unexpected error in worker loop: {e}")
                 time.sleep(1)  # Wait before continuing
 
+        # Jobs claimed in a batch but never started go back to the queue
+        self.release_buffered_jobs()
+
+        wakeup_fds, self._wakeup_fds = self._wakeup_fds, None
+        for fd in wakeup_fds:
+            os.close(fd)
+
         print(f"Worker {self.worker_id} stopped.")
 
+    @staticmethod
+    def buffer_output() -> None:
+        """
+        Stop stdout from flushing on every newline.
+
+        On a terminal stdout is line-buffered, so each of the ~5 lines a job
+        prints is its own write() syscall. The worker loops flush once per
+        job instead, so a job's log still appears as soon as it finishes.
+        """
+        if getattr(sys.stdout, 'line_buffering', False):
+            try:
+                sys.stdout.reconfigure(line_buffering=False)
+            except (AttributeError, ValueError):
+                pass  # Replaced or detached stream: leave it as it is
+
+    def run_concurrent(self, concurrency: int) -> None:
+        """
+        Run the worker loop with up to `concurrency` jobs executing at once.
+
+        Blocking entry point for run_async(); concurrency 1 is plain run().
+        """
+        if concurrency <= 1:
+            self.run()
+        else:
+            asyncio.run(self.run_async(concurrency))
+
+    async def run_async(self, concurrency: int = 8) -> None:
+        """
+        Main worker loop, running several jobs concurrently in one process.
+
+        Jobs are claimed exactly as in run(), but each runs as an asyncio
+        subprocess, so the worker keeps claiming while earlier jobs are still
+        executing, up to `concurrency` at once. Idle waits watch the wakeup
+        pipe through the event loop instead of blocking in select().
+
+        On SIGINT/SIGTERM no new jobs are claimed, and the worker stops once
+        the jobs already running have finished.
+
+        Args:
+            concurrency: Maximum number of jobs executing at the same time
+        """
+        loop = asyncio.get_running_loop()
+        self._install_child_watcher(loop)
+        wakeup = asyncio.Event()
+
+        def on_signal(signum):
+            signal_name = "SIGINT" if signum == signal.SIGINT else "SIGTERM"
+            print(f"\n{signal_name} received, shutting down gracefully...")
+            self.shutdown()
+            wakeup.set()
+
+        try:
+            for signum in (signal.SIGINT, signal.SIGTERM):
+                loop.add_signal_handler(signum, on_signal, signum)
+        except NotImplementedError:
+            self.setup_signal_handlers()  # No loop signal support (Windows)
+
+        def on_notify():
+            self.storage.wait_for_job(0)  # Consume the notification byte
+            wakeup.set()
+
+        notify_fd = self.storage.notify_fileno()
+        watching_notify = False
+
+        def watch_notify(enable):
+            # Enqueue notifications are only read while a slot is free: with
+            # every slot busy this worker can't take the job, so the byte is
+            # left in the pipe for an idle worker to wake on
+            nonlocal watching_notify
+            if notify_fd is None or enable == watching_notify:
+                return
+            if enable:
+                loop.add_reader(notify_fd, on_notify)
+            else:
+                loop.remove_reader(notify_fd)
+            watching_notify = enable
+
+        self.buffer_output()
+        print(f"Worker {self.worker_id} started ({concurrency} concurrent jobs). Waiting for jobs...")
+        print("Press Ctrl+C to stop gracefully.\n")
+
+        tasks = set()
+        try:
+            while self.running or tasks:
+                # Fill free slots with newly claimed jobs
+                while self.running and len(tasks) < concurrency:
+                    try:
+                        job = self.get_next_pending_job()
+                    except Exception as e:
+                        print(f"ERROR: Unexpected error in worker loop: {e}")
+                        await asyncio.sleep(1)  # Wait before continuing
+                        break
+                    if not job:
+                        break
+                    print(f"→ [{self.worker_id}] Claimed job: {job['id']}")
+                    tasks.add(asyncio.ensure_future(self._process_job_async(job)))
+
+                # Wait for a job to finish, or - with a slot free - for an
+                # enqueue wakeup or the next retry to come due
+                waiters = set(tasks)
+                timeout = None
+                slot_free = self.running and len(tasks) < concurrency
+                watch_notify(slot_free)
+                if slot_free:
+                    wakeup.clear()
+                    waiters.add(asyncio.ensure_future(wakeup.wait()))
+                    timeout = self.idle_timeout()
+
+                # Output of everything since the last wait goes out in one write
+                sys.stdout.flush()
+                done, _ = await asyncio.wait(
+                    waiters, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                for waiter in waiters - tasks:
+                    waiter.cancel()
+                tasks -= done
+        finally:
+            watch_notify(False)
+
+        # Jobs claimed in a batch but never started go back to the queue
+        self.release_buffered_jobs()
+
+        print(f"Worker {self.worker_id} stopped.")
+
+    @staticmethod
+    def _install_child_watcher(loop: asyncio.AbstractEventLoop) -> None:
+        """
+        Reap job subprocesses from the event loop through pidfds (Linux 5.3+).
+
+        Before Python 3.12 asyncio's default child watcher starts one thread
+        per subprocess, each blocked in waitpid(). PidfdChildWatcher instead
+        registers every child's pidfd with the loop's selector, so all exits
+        are collected by the loop itself as they happen: no threads, no
+        SIGCHLD handler. Python 3.12+ already does this by default.
+        """
+        if sys.version_info >= (3, 12) or not hasattr(asyncio, 'PidfdChildWatcher'):
+            return
+        try:
+            os.close(os.pidfd_open(os.getpid()))
+        except (AttributeError, OSError):
+            return  # No pidfd support: keep asyncio's default watcher
+        watcher = asyncio.PidfdChildWatcher()
+        watcher.attach_loop(loop)
+        asyncio.set_child_watcher(watcher)
+
+    async def _process_job_async(self, job: Dict[str, Any]) -> None:
+        """
+        Execute one claimed job and record its outcome (run_async's unit of work).
+        """
+        try:
+            exit_code = await self.execute_command_async(job['command'], job['id'])
+
+            if exit_code == 0:
+                self.mark_as_completed(job['id'])
+                print(f"✓ [{self.worker_id}] Job {job['id']} completed successfully\n")
+            else:
+                self.mark_as_failed(job['id'], job['attempts'], job['max_retries'])
+                print(f"✗ [{self.worker_id}] Job {job['id']} failed with exit code {exit_code}")
+                print()  # Blank line for readability
+
+        except Exception as e:
+            # Hand the job back so it doesn't stay stuck in 'processing'
+            # (mark_as_* may have failed before recording the outcome)
+            self.release_job(job['id'])
+            print(f"ERROR: Unexpected error in worker loop: {e}")
+
+    async def execute_command_async(self, command: str, job_id: str) -> int:
+        """
+        Execute a shell command as an asyncio subprocess; asyncio twin of
+        execute_command() with the same output logging and exit codes.
+
+        Args:
+            command: The shell command to execute
+            job_id: The job ID (for logging)
+
+        Returns:
+            Exit code (0 = success, non-zero = failure, 124 = timed out)
+        """
+        print(f"[{job_id}] Executing command: {command}")
+
+        plain = _split_plain_command(command)
+
+        try:
+            # As in execute_command(): log-dir errors fail this attempt
+            log_paths = self.job_log_paths(job_id)
+            if log_paths is None:
+                stdout, stderr = asyncio.subprocess.PIPE, asyncio.subprocess.PIPE
+            else:
+                stdout = open(log_paths[0], 'ab')
+                try:
+                    stderr = open(log_paths[1], 'ab')
+                except BaseException:
+                    stdout.close()
+                    raise
+            try:
+                proc = None
+                if plain is not None:
+                    executable, argv = plain
+                    try:
+                        proc = await asyncio.create_subprocess_exec(
+                            executable, *argv[1:], stdout=stdout, stderr=stderr
+                        )
+                    except FileNotFoundError:
+                        # Stale cached program path: let the shell resolve it
+                        _resolve_program.cache_clear()
+                if proc is None:
+                    proc = await asyncio.create_subprocess_shell(
+                        command, stdout=stdout, stderr=stderr
+                    )
+            finally:
+                if log_paths is not None:
+                    stdout.close()  # The child holds its own copies
+                    stderr.close()
+
+            try:
+                out, err = await asyncio.wait_for(proc.communicate(), timeout=300)
+            except asyncio.TimeoutError:
+                proc.kill()
+                await proc.wait()
+                print(f"[{job_id}] ERROR: Command timed out after 300 seconds")
+                return 124  # Standard timeout exit code
+
+            # Log the output
+            if log_paths is not None:
+                print(f"[{job_id}] Output logged to {log_paths[0]}, {log_paths[1]}")
+            if out:
+                print(f"[{job_id}] STDOUT:\n{out.decode(errors='replace')}")
+            if err:
+                print(f"[{job_id}] STDERR:\n{err.decode(errors='replace')}")
+
+            print(f"[{job_id}] Exit code: {proc.returncode}")
+            return proc.returncode
+
+        except Exception as e:
+            print(f"[{job_id}] ERROR: Failed to execute command: {e}")
+            return 1  # Generic failure exit code
+
+    def idle_timeout(self) -> float:
+        """
+        How long an idle worker may wait before checking the queue again.
+
+        Retries this worker scheduled itself come from its timing wheel
+        without touching the database; only when the wheel is empty is the
+        database asked (retries left by other workers or earlier runs).
+
+        Returns:
+            IDLE_POLL_INTERVAL, or less if a scheduled retry is due sooner
+        """
+        if self.retry_wheel.pop_due():
+            return 0  # One of our retries just became claimable
+        retry_in = self.retry_wheel.time_until_next()
+        if retry_in is None:
+            retry_in = self.storage.seconds_until_next_retry()
+        if retry_in is None:
+            return IDLE_POLL_INTERVAL
+        return min(IDLE_POLL_INTERVAL, retry_in)
+
     def setup_signal_handlers(self) -> None:
         """
         Set up signal handlers for graceful shutdown.
@@ -255,6 +716,13 @@ class Worker:
             signal_name = "SIGINT" if signum == signal.SIGINT else "SIGTERM"
             print(f"\n{signal_name} received, shutting down gracefully...")
             self.shutdown()
+            # Wake an idle wait_for_job() now instead of at its timeout; the
+            # loop then sees running == False. Mid-job, the byte just waits.
+            if self._wakeup_fds is not None:
+                try:
+                    os.write(self._wakeup_fds[1], b'x')
+                except OSError:
+                    pass  # Pipe full (a wakeup is already pending) or closed
 
         # Register signal handlers
         signal.signal(signal.SIGINT, signal_handler)   # Ctrl+C
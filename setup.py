@@ -7,6 +7,7 @@ setup(
     packages=find_packages(),
     install_requires=[
         "click>=8.1.0",
+        "orjson>=3.6.0",
     ],
     entry_points={
         "console_scripts": [
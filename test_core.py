@@ -4,102 +4,331 @@ Core Test Script for queuectl
 Tests the essential flows of the job queue system.
 """
 
+import contextlib
+import io
+import multiprocessing
+import sqlite3
 import subprocess
 import time
 import os
 import sys
 
-
-def run_command(cmd, capture_output=True):
-    """Run a shell command and return result."""
+import orjson
+
+from queuectl.storage import SCHEMA_VERSION, Storage
+from queuectl.timerwheel import HashedTimerWheel
+
+# Report separators
+_BAR = "=" * 60
+_DASH = "-" * 60
+_HDR = "\n" + _BAR
+
+# Test databases live on tmpfs when there is one: every test crosses a
+# process boundary (so no :memory: database), but nothing needs to hit disk
+DB_DIR = "/dev/shm" if os.access("/dev/shm", os.W_OK) else "."
+
+# How tests run queuectl: the interpreter itself, with an absolute path, so
+# subprocess can use its posix_spawn() fast path (the bare `queuectl` name
+# would need a PATH lookup and the installed wrapper script)
+QUEUECTL = (sys.executable, '-m', 'queuectl')
+
+# CLI output the tests look for; run_command() output stays bytes
+_MSG_ENQUEUED = b"successfully enqueued"
+_MSG_BATCH_ENQUEUED = b"2 job(s) successfully enqueued"
+_MSG_STATUS = b"Job Queue Status"
+_MSG_PRIORITY_HIGH = b"Priority: high"
+_MSG_PRIORITY_MEDIUM = b"Priority: medium"
+_MSG_INVALID_PRIORITY = b"Invalid priority"
+_MSG_UNKNOWN_FIELD = b"unknown field(s): bogus"
+
+# Job payloads, serialized once at import. They stay bytes all the way into
+# the child's argv/stdin, so nothing is re-formatted or re-encoded per call.
+TEST_1_JOB = orjson.dumps({"id": "test-1", "command": "echo Hello World"})
+TEST_2_JOB = orjson.dumps({"id": "test-2", "command": "echo Test execution"})
+TEST_3_JOB = orjson.dumps({"id": "test-3", "command": "exit 1"})
+TEST_4_JOB = orjson.dumps({"id": "test-4", "command": "exit 1", "max_retries": 2})
+MULTI_JOB_IDS = frozenset(f"multi-{i}" for i in range(1, 6))
+MULTI_JOBS = b"".join(
+    orjson.dumps({"id": f"multi-{i}", "command": f"echo Job {i}"}) + b"\n"
+    for i in range(1, 6)
+)
+DEFAULT_PRIORITY_JOB = orjson.dumps({"id": "default-test", "command": "echo test"})
+INVALID_PRIORITY_JOB = orjson.dumps(
+    {"id": "invalid-test", "command": "echo test", "priority": "urgent"}
+)
+# The jobs table as the first release created it (next_retry_at as ISO
+# TEXT, no priority_int), plus the half-built table an interrupted
+# next_retry_at conversion could leave behind
+BASELINE_SCHEMA = """
+    CREATE TABLE jobs (
+        id TEXT PRIMARY KEY,
+        command TEXT NOT NULL,
+        priority TEXT DEFAULT 'medium',
+        state TEXT NOT NULL,
+        attempts INTEGER DEFAULT 0,
+        max_retries INTEGER DEFAULT 3,
+        created_at TEXT NOT NULL,
+        updated_at TEXT NOT NULL,
+        locked_by TEXT,
+        locked_at TEXT,
+        next_retry_at TEXT
+    );
+    CREATE TABLE config (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+    CREATE TABLE jobs_new (id TEXT PRIMARY KEY);
+"""
+CONCURRENT_JOB_IDS = frozenset(f"conc-{i}" for i in range(1, 5))
+CONCURRENT_JOBS = b"".join(
+    orjson.dumps({"id": job_id, "command": "sleep 1"}) + b"\n"
+    for job_id in sorted(CONCURRENT_JOB_IDS)
+)
+STDIN_JOB = orjson.dumps({"id": "stdin-1", "command": "echo $HOME | tr a-z A-Z"})
+PAGE_JOBS = b"".join(
+    orjson.dumps({"id": f"page-{i}", "command": f"echo Page {i}"}) + b"\n"
+    for i in range(1, 6)
+)
+LOG_DIR_JOB = orjson.dumps({"id": "log-dir-test", "command": "echo logged", "max_retries": 1})
+
+
+def run_command(cmd, capture_output=True, input=None):
+    """
+    Run a command (optionally feeding it stdin) and return result.
+
+    Pass an argv list: it is exec'd directly, without a /bin/sh in between.
+    A string still goes through the shell, for commands that need one.
+    close_fds=False (nothing inheritable is open here: Python creates fds
+    non-inheritable) lets subprocess spawn with posix_spawn().
+
+    Output is left as bytes (check it against bytes, e.g. the _MSG_*
+    constants), and input, if given, must be bytes too.
+    """
     result = subprocess.run(
         cmd,
-        shell=True,
+        shell=isinstance(cmd, str),
+        close_fds=False,
         capture_output=capture_output,
-        text=True
+        input=input
     )
     return result
 
 
-def cleanup():
-    """Remove test database if it exists."""
-    if os.path.exists("queue.db"):
-        os.remove("queue.db")
+def run_command_discard_output(cmd, input=None):
+    """
+    Run a command whose output the caller never looks at.
+
+    stdout/stderr go to /dev/null and nothing is decoded; only the return
+    code is meaningful. input, if given, is bytes.
+    """
+    return subprocess.run(
+        cmd,
+        shell=isinstance(cmd, str),
+        close_fds=False,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        input=input
+    )
+
+
+# Storage per database path, opened once and reused by every check
+_STORAGES = {}
+
+
+def queue_storage():
+    """
+    Return this process's Storage for the current test database.
+
+    Assertions read the queue in-process through it, instead of starting a
+    `queuectl list` interpreter just to read a few rows back.
+    """
+    db_path = os.environ.get("QUEUECTL_DB_PATH", "queue.db")
+    if db_path not in _STORAGES:
+        _STORAGES[db_path] = Storage(db_path)
+    return _STORAGES[db_path]
+
+
+def close_storage(db_path):
+    """Close and forget this process's Storage for db_path, if one is open."""
+    storage = _STORAGES.pop(db_path, None)
+    if storage is not None:
+        storage.close()
+
+
+def jobs_in_state(state):
+    """Return the set of IDs of jobs currently in state ("dead" = the DLQ)."""
+    return set(queue_storage().list_job_ids(state=state))
+
+
+def wait_until(condition, timeout=10, interval=0.05):
+    """
+    Poll condition() until it is true.
+
+    Each check is an in-process query (see queue_storage()), so polling
+    every `interval` seconds is cheap: a healthy run returns right after
+    the state change it waits for, and a broken one gives up after
+    `timeout` seconds.
+
+    Returns:
+        True if the condition held before the timeout
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        if condition():
+            return True
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        time.sleep(min(interval, remaining))
+
+
+def wait_for_jobs(job_ids, state, timeout=10):
+    """
+    Wait until every job ID is in state (see wait_until()).
+
+    Returns:
+        True if all jobs reached the state before the timeout
+    """
+    job_ids = set(job_ids)
+    return wait_until(lambda: job_ids <= jobs_in_state(state), timeout)
+
+
+def uses_worker(test_func):
+    """
+    Mark a test as relying on its group's shared worker.
+
+    run_group() starts one long-running `queuectl worker start` before the
+    first such test and stops it after the group, so these tests only
+    enqueue and wait instead of each paying for a worker start.
+    """
+    test_func.uses_worker = True
+    return test_func
+
+
+def start_worker(*args):
+    """
+    Start `queuectl worker start` (plus args) in the background.
+
+    Output goes to /dev/null: nothing reads it, and an unread pipe would
+    stall a chatty worker once its buffer fills. Set TEST_WORKER_LOG_DIR to
+    keep it instead: each worker then writes to a new worker-*.log there.
+    """
+    log_dir = os.environ.get("TEST_WORKER_LOG_DIR")
+    if not log_dir:
+        return subprocess.Popen(
+            [*QUEUECTL, 'worker', 'start', *args],
+            close_fds=False,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
+        )
+    log_path = os.path.join(log_dir, f"worker-{os.getpid()}-{time.time_ns()}.log")
+    with open(log_path, "wb") as log:
+        # The child keeps its own copy of the file descriptor
+        return subprocess.Popen(
+            [*QUEUECTL, 'worker', 'start', *args],
+            close_fds=False,
+            stdout=log,
+            stderr=subprocess.STDOUT
+        )
+
+
+def stop_worker(worker):
+    """
+    Stop a worker started by start_worker() and wait for it to exit.
+
+    SIGTERM shuts down an idle worker at once (a busy one after its current
+    job); one that hasn't exited within 3 seconds is killed, so it can
+    never outlive the test run.
+    """
+    worker.terminate()
+    try:
+        worker.wait(timeout=3)
+    except subprocess.TimeoutExpired:
+        worker.kill()
+        worker.wait()
+
+
+def cleanup(db_path=None):
+    """Remove test database (and its WAL side files and wakeup pipe) if it exists."""
+    if db_path is None:
+        db_path = os.environ.get("QUEUECTL_DB_PATH", "queue.db")
+    # Never leave the shared connection pointing at a deleted file
+    close_storage(db_path)
+    if os.path.exists(db_path):
+        os.remove(db_path)
         print("✓ Cleaned up test database")
+    for suffix in ("-wal", "-shm", ".notify"):
+        if os.path.exists(db_path + suffix):
+            os.remove(db_path + suffix)
 
 
 def test_enqueue():
     """Test 1: Enqueue a job."""
     print("\n[Test 1] Enqueue job...")
-    result = run_command('queuectl enqueue \'{"id":"test-1","command":"echo Hello World"}\'')
-    if result.returncode == 0 and "successfully enqueued" in result.stdout:
+    result = run_command([*QUEUECTL, 'enqueue', TEST_1_JOB])
+    if result.returncode == 0 and _MSG_ENQUEUED in result.stdout:
         print("✓ PASS: Job enqueued")
         return True
     print("✗ FAIL: Job enqueue failed")
     return False
 
 
+def test_enqueue_batch():
+    """Test 1b: Enqueue several jobs from an NDJSON file in one call."""
+    print("\n[Test 1b] Enqueue batch...")
+    with open("batch.ndjson", "w") as f:
+        f.write('{"id":"batch-1","command":"echo Batch 1"}\n')
+        f.write('{"id":"batch-2","command":"echo Batch 2","priority":"high"}\n')
+    result = run_command([*QUEUECTL, 'enqueue-batch', 'batch.ndjson'])
+    os.remove("batch.ndjson")
+    if result.returncode != 0 or _MSG_BATCH_ENQUEUED not in result.stdout:
+        print("✗ FAIL: Batch enqueue failed")
+        return False
+
+    if {"batch-1", "batch-2"} <= jobs_in_state("pending"):
+        print("✓ PASS: Batch jobs enqueued")
+        return True
+    print("✗ FAIL: Batch jobs not found in queue")
+    return False
+
+
+@uses_worker
 def test_worker_execution():
     """Test 2: Worker processes a job successfully."""
     print("\n[Test 2] Worker execution...")
     
     # Enqueue a job
-    run_command('queuectl enqueue \'{"id":"test-2","command":"echo Test execution"}\'')
+    run_command_discard_output([*QUEUECTL, 'enqueue', TEST_2_JOB])
     
-    # Start worker in background
-    worker = subprocess.Popen(
-        'queuectl worker start',
-        shell=True,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True
-    )
-    
-    # Wait for job to be processed
-    time.sleep(3)
-    
-    # Stop worker
-    worker.terminate()
-    worker.wait(timeout=2)
+    # Wait for the group's worker to process it
+    wait_for_jobs({"test-2"}, "completed", timeout=10)
     
     # Check if job completed
-    result = run_command('queuectl list --state completed')
-    if "test-2" in result.stdout:
+    if "test-2" in jobs_in_state("completed"):
         print("✓ PASS: Worker executed job successfully")
         return True
     print("✗ FAIL: Worker execution failed")
     return False
 
 
+@uses_worker
 def test_job_failure():
     """Test 3: Worker handles job failure."""
     print("\n[Test 3] Job failure handling...")
     
     # Enqueue a failing job
-    run_command('queuectl enqueue \'{"id":"test-3","command":"exit 1"}\'')
+    run_command_discard_output([*QUEUECTL, 'enqueue', TEST_3_JOB])
     
-    # Start worker
-    worker = subprocess.Popen(
-        'queuectl worker start',
-        shell=True,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True
-    )
-    
-    time.sleep(3)
-    worker.terminate()
-    worker.wait(timeout=2)
+    # Wait for the group's worker to attempt it: back in pending with attempts > 0
+    def retried():
+        job = queue_storage().get_job("test-3")
+        return job['state'] == 'pending' and job['attempts'] > 0
+    wait_until(retried, timeout=10)
     
     # Check if job is in failed or pending (retry)
-    result = run_command('queuectl list --state failed')
-    if "test-3" in result.stdout:
+    if "test-3" in jobs_in_state("failed"):
         print("✓ PASS: Job failure handled")
         return True
     
     # Check if it's pending (retry logic)
-    result = run_command('queuectl list --state pending')
-    if "test-3" in result.stdout:
+    if "test-3" in jobs_in_state("pending"):
         print("✓ PASS: Job failure handled (retry)")
         return True
     
@@ -107,31 +336,19 @@ def test_job_failure():
     return False
 
 
+@uses_worker
 def test_retry_and_dlq():
     """Test 4: Retry mechanism and DLQ."""
     print("\n[Test 4] Retry and DLQ...")
     
     # Enqueue a failing job with max_retries=2
-    run_command('queuectl enqueue \'{"id":"test-4","command":"exit 1","max_retries":2}\'')
-    
-    # Start worker to process retries
-    worker = subprocess.Popen(
-        'queuectl worker start',
-        shell=True,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True
-    )
-    
-    # Wait for retries to complete
-    time.sleep(8)
+    run_command_discard_output([*QUEUECTL, 'enqueue', TEST_4_JOB])
     
-    worker.terminate()
-    worker.wait(timeout=2)
+    # Wait for the group's worker to exhaust the retries
+    wait_for_jobs({"test-4"}, "dead", timeout=15)
     
     # Check if job is in DLQ
-    result = run_command('queuectl dlq list')
-    if "test-4" in result.stdout:
+    if "test-4" in jobs_in_state("dead"):
         print("✓ PASS: Job moved to DLQ after retries")
         return True
     print("✗ FAIL: Retry/DLQ mechanism failed")
@@ -142,28 +359,22 @@ def test_multi_worker():
     """Test 5: Multi-worker concurrency."""
     print("\n[Test 5] Multi-worker concurrency...")
     
-    # Enqueue multiple jobs
-    for i in range(1, 6):
-        run_command(f'queuectl enqueue \'{{"id":"multi-{i}","command":"echo Job {i}"}}\'')
+    # Enqueue multiple jobs: one enqueue-batch call reading NDJSON from stdin
+    result = run_command_discard_output([*QUEUECTL, 'enqueue-batch', '-'], input=MULTI_JOBS)
+    if result.returncode != 0:
+        print("✗ FAIL: Could not enqueue multi-worker jobs")
+        return False
     
     # Start 2 workers
-    worker = subprocess.Popen(
-        'queuectl worker start --count 2',
-        shell=True,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True
-    )
+    worker = start_worker('--count', '2')
     
     # Wait for jobs to be processed
-    time.sleep(5)
+    wait_for_jobs(MULTI_JOB_IDS, "completed", timeout=15)
     
-    worker.terminate()
-    worker.wait(timeout=3)
+    stop_worker(worker)
     
     # Check how many completed
-    result = run_command('queuectl list --state completed')
-    completed = sum(1 for i in range(1, 6) if f"multi-{i}" in result.stdout)
+    completed = len(MULTI_JOB_IDS & jobs_in_state("completed"))
     
     if completed >= 3:  # At least 3 out of 5 should complete
         print(f"✓ PASS: Multi-worker processed {completed}/5 jobs")
@@ -175,8 +386,8 @@ def test_multi_worker():
 def test_status():
     """Test 6: Status command."""
     print("\n[Test 6] Status command...")
-    result = run_command('queuectl status')
-    if result.returncode == 0 and "Job Queue Status" in result.stdout:
+    result = run_command([*QUEUECTL, 'status'])
+    if result.returncode == 0 and _MSG_STATUS in result.stdout:
         print("✓ PASS: Status command works")
         return True
     print("✗ FAIL: Status command failed")
@@ -203,50 +414,42 @@ def test_priority_queue():
 
     print("  Enqueuing jobs in order: LOW, LOW, MEDIUM, MEDIUM, HIGH, HIGH")
     for job_json, job_id, priority in jobs:
-        result = run_command(f'queuectl enqueue \'{job_json}\'')
+        result = run_command([*QUEUECTL, 'enqueue', job_json])
         if result.returncode != 0:
             print(f"✗ FAIL: Could not enqueue job {job_id}")
             return False
         # Verify priority is shown during enqueue
-        if f"Priority: {priority}" not in result.stdout:
+        if f"Priority: {priority}".encode() not in result.stdout:
             print(f"✗ FAIL: Priority '{priority}' not displayed for job {job_id}")
             return False
 
     # Verify all jobs were created
-    result = run_command('queuectl list')
-    created_count = sum(1 for _, job_id, _ in jobs if job_id in result.stdout)
+    job_ids = {job_id for _, job_id, _ in jobs}
+    created_count = len(job_ids.intersection(queue_storage().list_job_ids()))
     if created_count < 6:
         print(f"✗ FAIL: Only {created_count}/6 jobs were created")
         return False
 
     # Start worker to process jobs
     print("  Starting worker to process jobs...")
-    worker = subprocess.Popen(
-        'queuectl worker start',
-        shell=True,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True
-    )
+    worker = start_worker()
 
     # Wait for all jobs to complete
-    time.sleep(3)
+    wait_for_jobs(job_ids, "completed", timeout=10)
 
-    worker.terminate()
-    worker.wait(timeout=2)
+    stop_worker(worker)
 
     # Check that all jobs completed
     print("  Verifying jobs completed...")
-    result = run_command('queuectl list --state completed')
-    completed_count = sum(1 for _, job_id, _ in jobs if job_id in result.stdout)
+    completed_count = len(job_ids & jobs_in_state("completed"))
 
     if completed_count < 6:
         print(f"✗ FAIL: Only {completed_count}/6 jobs completed")
         return False
 
     # Verify that priority information is displayed in list
-    result = run_command('queuectl list')
-    if "Priority: high" not in result.stdout:
+    result = run_command([*QUEUECTL, 'list'])
+    if _MSG_PRIORITY_HIGH not in result.stdout:
         print("✗ FAIL: Priority not displayed in list output")
         return False
 
@@ -259,20 +462,20 @@ def test_default_priority():
     print("\n[Test 8] Default priority (medium)...")
 
     # Enqueue job without specifying priority
-    result = run_command('queuectl enqueue \'{"id":"default-test","command":"echo test"}\'')
+    result = run_command([*QUEUECTL, 'enqueue', DEFAULT_PRIORITY_JOB])
 
     if result.returncode != 0:
         print("✗ FAIL: Could not enqueue job")
         return False
 
     # Check if priority is medium
-    if "Priority: medium" in result.stdout:
+    if _MSG_PRIORITY_MEDIUM in result.stdout:
         print("✓ PASS: Default priority is medium")
         return True
 
     # Also check in list command
-    result = run_command('queuectl list')
-    if "default-test" in result.stdout and "Priority: medium" in result.stdout:
+    result = run_command([*QUEUECTL, 'list'])
+    if b"default-test" in result.stdout and _MSG_PRIORITY_MEDIUM in result.stdout:
         print("✓ PASS: Default priority is medium (verified in list)")
         return True
 
@@ -285,9 +488,9 @@ def test_invalid_priority():
     print("\n[Test 9] Invalid priority rejection...")
 
     # Try to enqueue job with invalid priority
-    result = run_command('queuectl enqueue \'{"id":"invalid-test","command":"echo test","priority":"urgent"}\'')
+    result = run_command([*QUEUECTL, 'enqueue', INVALID_PRIORITY_JOB])
 
-    if result.returncode != 0 and "Invalid priority" in result.stderr:
+    if result.returncode != 0 and _MSG_INVALID_PRIORITY in result.stderr:
         print("✓ PASS: Invalid priority rejected")
         return True
 
@@ -295,41 +498,414 @@ def test_invalid_priority():
     return False
 
 
+@uses_worker
+def test_unusable_log_dir():
+    """Test 10: A log-dir that can't be created fails the job attempt."""
+    print("\n[Test 10] Unusable log-dir...")
+
+    # A directory under the database file can never be created
+    log_dir = os.path.join(os.environ["QUEUECTL_DB_PATH"], "logs")
+    run_command_discard_output([*QUEUECTL, 'config', 'set', 'log-dir', log_dir])
+    run_command_discard_output([*QUEUECTL, 'enqueue', LOG_DIR_JOB])
+
+    # The attempt must count: the job runs out of retries and lands in the
+    # DLQ, rather than being handed back with its attempts unchanged forever
+    wait_for_jobs({"log-dir-test"}, "dead", timeout=15)
+
+    job = queue_storage().get_job("log-dir-test")
+    if job['state'] == 'dead' and job['attempts'] == 1:
+        print("✓ PASS: Unusable log-dir failed the job")
+        return True
+    print(f"✗ FAIL: Job is {job['state']} after {job['attempts']} attempt(s)")
+    return False
+
+
+def test_schema_upgrade():
+    """Test 11: A baseline-schema database is upgraded to the current schema."""
+    print("\n[Test 11] Schema upgrade...")
+
+    db_path = os.environ["QUEUECTL_DB_PATH"] + ".baseline.db"
+    cleanup(db_path)
+    conn = sqlite3.connect(db_path)
+    with conn:
+        conn.executescript(BASELINE_SCHEMA)
+        conn.execute(
+            "INSERT INTO jobs (id, command, priority, state, attempts, created_at,"
+            " updated_at, next_retry_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            ("old-1", "echo old", "high", "pending", 1, "2024-01-02T03:00:00+00:00",
+             "2024-01-02T03:00:00+00:00", "2024-01-02T03:04:05.500000+00:00")
+        )
+    conn.close()
+
+    try:
+        Storage(db_path).close()
+
+        conn = sqlite3.connect(db_path)
+        try:
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            types = {row[1]: row[2] for row in conn.execute("PRAGMA table_info(jobs)")}
+            tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+            row = conn.execute(
+                "SELECT next_retry_at, priority_int FROM jobs WHERE id = 'old-1'"
+            ).fetchone()
+        finally:
+            conn.close()
+    finally:
+        cleanup(db_path)
+
+    # 2024-01-02T03:04:05.5Z as unix seconds
+    if (version == SCHEMA_VERSION and types.get('next_retry_at') == 'REAL'
+            and 'jobs_new' not in tables and row is not None
+            and abs(row[0] - 1704164645.5) < 0.001 and row[1] == 3):
+        print(f"✓ PASS: Database upgraded to schema version {version}")
+        return True
+    print(f"✗ FAIL: Upgrade gave version {version}, columns {types}, row {row}")
+    return False
+
+
+def test_concurrent_worker():
+    """Test 12: One worker with --concurrency runs jobs side by side."""
+    print("\n[Test 12] Concurrent worker...")
+
+    run_command_discard_output([*QUEUECTL, 'enqueue-batch', '-'], input=CONCURRENT_JOBS)
+
+    # Four 1-second jobs: run one after another they need 4 s or more
+    started = time.monotonic()
+    worker = start_worker('--concurrency', '4')
+    wait_for_jobs(CONCURRENT_JOB_IDS, "completed", timeout=10)
+    elapsed = time.monotonic() - started
+    stop_worker(worker)
+
+    completed = len(CONCURRENT_JOB_IDS & jobs_in_state("completed"))
+    if completed == 4 and elapsed < 3:
+        print(f"✓ PASS: 4 jobs completed together in {elapsed:.1f}s")
+        return True
+    print(f"✗ FAIL: {completed}/4 jobs completed in {elapsed:.1f}s")
+    return False
+
+
+class FakeClock:
+    """Manually advanced clock for HashedTimerWheel tests (call it for the time)."""
+
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_timer_wheel_tick_boundary():
+    """Test 13: Timers fire on the first tick at or after their deadline."""
+    print("\n[Test 13] Timer wheel tick boundaries...")
+    clock = FakeClock()
+    wheel = HashedTimerWheel(tick=0.1, wheel_size=8, clock=clock)
+
+    wheel.schedule('before', 0.05)   # Mid-tick: rounds up to the 0.1 boundary
+    wheel.schedule('on', 0.1)        # Exactly on the boundary
+    wheel.schedule('after', 0.15)    # Just past it: waits for the 0.2 boundary
+
+    clock.now = 0.06
+    early = wheel.pop_due()
+    clock.now = 0.1
+    first = wheel.pop_due()
+    clock.now = 0.19
+    between = wheel.pop_due()
+    clock.now = 0.2
+    second = wheel.pop_due()
+
+    if (early, first, between, second) == ([], ['before', 'on'], [], ['after']) and not wheel:
+        print("✓ PASS: Timers fired on their tick, never early")
+        return True
+    print(f"✗ FAIL: Fired {early}, {first}, {between}, {second}")
+    return False
+
+
+def test_timer_wheel_long_delay():
+    """Test 14: Delays longer than one wheel revolution wait their full time."""
+    print("\n[Test 14] Timer wheel delays beyond one revolution...")
+    clock = FakeClock()
+    wheel = HashedTimerWheel(tick=0.1, wheel_size=8, clock=clock)  # 0.8 s per revolution
+
+    wheel.schedule('far', 2.05)   # Tick 21: shares bucket 5 with ticks 5 and 13
+    wheel.schedule('near', 0.5)   # Tick 5
+    waits = []
+    fired = []
+    for now in (0.3, 0.5, 1.3, 2.0, 2.1):
+        clock.now = now
+        fired.append(wheel.pop_due())
+        waits.append(wheel.time_until_next())
+
+    expected_fired = [[], ['near'], [], [], ['far']]
+    expected_waits = [0.2, 1.6, 0.8, 0.1, None]
+    waits = [None if wait is None else round(wait, 6) for wait in waits]
+    if fired == expected_fired and waits == expected_waits:
+        print("✓ PASS: Long delay skipped earlier revolutions")
+        return True
+    print(f"✗ FAIL: Fired {fired}, waits {waits}")
+    return False
+
+
+def test_timer_wheel_idle_gap():
+    """Test 15: Scheduling after a long idle gap (no pop_due() calls in between)."""
+    print("\n[Test 15] Timer wheel after an idle gap...")
+    clock = FakeClock()
+    wheel = HashedTimerWheel(tick=0.1, wheel_size=8, clock=clock)
+
+    wheel.schedule('stale', 0.2)
+    clock.now = 100.0   # Hundreds of revolutions later, wheel never polled
+    wheel.schedule('fresh', 0.3)
+
+    overdue = wheel.time_until_next()
+    stale = wheel.pop_due()
+    wait = wheel.time_until_next()
+    clock.now = 100.3
+    fresh = wheel.pop_due()
+
+    if (overdue == 0.0 and stale == ['stale'] and wait is not None
+            and abs(wait - 0.3) < 1e-6 and fresh == ['fresh'] and not wheel):
+        print("✓ PASS: Overdue timer fired at once, new one on time")
+        return True
+    print(f"✗ FAIL: overdue wait {overdue}, fired {stale} then {fresh}, wait {wait}")
+    return False
+
+
+def test_timer_wheel_empty():
+    """Test 16: An empty wheel has nothing to wait for."""
+    print("\n[Test 16] Empty timer wheel...")
+    clock = FakeClock()
+    wheel = HashedTimerWheel(tick=0.1, wheel_size=8, clock=clock)
+
+    empty = wheel.time_until_next()
+    wheel.schedule('only', 0.1)
+    clock.now = 0.1
+    wheel.pop_due()
+    drained = wheel.time_until_next()
+
+    if empty is None and drained is None and len(wheel) == 0 and wheel.pop_due() == []:
+        print("✓ PASS: Empty wheel reports no deadline")
+        return True
+    print(f"✗ FAIL: time_until_next gave {empty} (new), {drained} (drained)")
+    return False
+
+
+def test_batch_claim_order():
+    """Test 17: A claim batch takes the top K jobs in priority order."""
+    print("\n[Test 17] Batch claim order...")
+    order_path = os.environ["QUEUECTL_DB_PATH"] + ".order"
+    run_command_discard_output([*QUEUECTL, 'config', 'set', 'claim-batch-size', '3'])
+
+    # Enqueued out of priority order; each job records when it starts
+    jobs = [("low-1", "low"), ("high-1", "high"), ("med-1", "medium"),
+            ("high-2", "high"), ("low-2", "low")]
+    batch = b"".join(
+        orjson.dumps({"id": job_id, "priority": priority,
+                      "command": f"echo {job_id} >> {order_path}; sleep 0.3"}) + b"\n"
+        for job_id, priority in jobs
+    )
+    run_command_discard_output([*QUEUECTL, 'enqueue-batch', '-'], input=batch)
+
+    worker = start_worker()
+    # The first claim locks the top three at once; the rest stay pending
+    wait_until(lambda: jobs_in_state("processing"), timeout=10)
+    first_batch = jobs_in_state("processing")
+    wait_for_jobs({job_id for job_id, _ in jobs}, "completed", timeout=15)
+    stop_worker(worker)
+
+    with open(order_path) as f:
+        order = f.read().split()
+    os.remove(order_path)
+
+    if (first_batch == {"high-1", "high-2", "med-1"}
+            and order == ["high-1", "high-2", "med-1", "low-1", "low-2"]):
+        print("✓ PASS: Batch claimed the top 3 jobs and ran them in priority order")
+        return True
+    print(f"✗ FAIL: First batch {sorted(first_batch)}, run order {order}")
+    return False
+
+
+def test_batch_release_on_stop():
+    """Test 18: Jobs still buffered when a worker stops go back to pending."""
+    print("\n[Test 18] Batch release on stop...")
+    # claim-batch-size is still 3 (see test_batch_claim_order)
+    job_ids = {f"buffered-{i}" for i in range(1, 5)}
+    batch = b"".join(
+        orjson.dumps({"id": job_id, "command": "sleep 1"}) + b"\n"
+        for job_id in sorted(job_ids)
+    )
+    run_command_discard_output([*QUEUECTL, 'enqueue-batch', '-'], input=batch)
+
+    worker = start_worker()
+    claimed = wait_until(lambda: len(jobs_in_state("processing")) == 3, timeout=10)
+    # SIGTERM: the running job finishes, the two buffered ones are released
+    stop_worker(worker)
+
+    completed = job_ids & jobs_in_state("completed")
+    pending = job_ids & jobs_in_state("pending")
+    unlocked = all(queue_storage().get_job(job_id)['locked_by'] is None for job_id in pending)
+    if claimed and len(completed) == 1 and len(pending) == 3 and unlocked:
+        print("✓ PASS: Buffered jobs returned to pending when the worker stopped")
+        return True
+    print(f"✗ FAIL: {len(completed)} completed, {len(pending)} pending, unlocked={unlocked}")
+    return False
+
+
+def test_enqueue_stdin():
+    """Test 19: `enqueue -` reads the job JSON from stdin."""
+    print("\n[Test 19] Enqueue from stdin...")
+    # Shell syntax in the command needs no quoting when it comes in on stdin
+    result = run_command([*QUEUECTL, 'enqueue', '-'], input=STDIN_JOB)
+    if result.returncode == 0 and _MSG_ENQUEUED in result.stdout:
+        job = queue_storage().get_job("stdin-1")
+        if job is not None and job['command'] == "echo $HOME | tr a-z A-Z":
+            print("✓ PASS: Job enqueued from stdin")
+            return True
+    print("✗ FAIL: Enqueue from stdin failed")
+    return False
+
+
+def test_list_unknown_field():
+    """Test 20: `list --fields` rejects unknown column names."""
+    print("\n[Test 20] List with an unknown field...")
+    result = run_command([*QUEUECTL, 'list', '--fields', 'id,bogus'])
+    if result.returncode != 0 and _MSG_UNKNOWN_FIELD in result.stderr:
+        print("✓ PASS: Unknown field rejected")
+        return True
+    print("✗ FAIL: Unknown field not rejected")
+    return False
+
+
+def test_list_paging():
+    """Test 21: --offset/--limit page through the full listing."""
+    print("\n[Test 21] List paging...")
+    run_command_discard_output([*QUEUECTL, 'enqueue-batch', '-'], input=PAGE_JOBS)
+
+    def listed_ids(*args):
+        result = run_command([*QUEUECTL, 'list', '--fields', 'id', *args])
+        return [line[len(b"Job ID: "):] for line in result.stdout.splitlines()
+                if line.startswith(b"Job ID: ")]
+
+    everything = listed_ids()
+    pages = []
+    offset = 0
+    while True:
+        page = listed_ids('--limit', '2', '--offset', str(offset))
+        if not page:
+            break
+        if len(page) > 2:
+            print(f"✗ FAIL: Page at offset {offset} has {len(page)} jobs")
+            return False
+        pages.extend(page)
+        offset += 2
+
+    if len(everything) >= 5 and pages == everything:
+        print(f"✓ PASS: {len(everything)} jobs paged through in order, 2 at a time")
+        return True
+    print(f"✗ FAIL: Pages gave {pages}, full list {everything}")
+    return False
+
+
+def group_db_path(group):
+    """Database path for a test group, unique to this test run."""
+    return os.path.join(DB_DIR, f"queuectl-test-{os.getpid()}-{group}.db")
+
+
+def run_group(group):
+    """
+    Run one group of tests in order against the group's own database.
+
+    Called in a pool worker: QUEUECTL_DB_PATH is set for this process, so
+    every queuectl command (and worker) the tests start uses that database.
+    Output is buffered and returned, so groups running side by side don't
+    interleave their prints.
+
+    Args:
+        group: (database path, [(test name, test function), ...])
+
+    Returns:
+        (captured output, [(test name, passed), ...])
+    """
+    db_path, tests = group
+    os.environ["QUEUECTL_DB_PATH"] = db_path
+    output = io.StringIO()
+    results = []
+    worker = None
+    with contextlib.redirect_stdout(output):
+        cleanup()
+        # Create the database (schema, WAL mode) once, up front, through
+        # the connection the assertions share; queuectl calls then find it ready
+        queue_storage()
+        try:
+            for test_name, test_func in tests:
+                # Started lazily: earlier tests may check jobs are still pending
+                if worker is None and getattr(test_func, 'uses_worker', False):
+                    worker = start_worker()
+                try:
+                    passed = test_func()
+                    results.append((test_name, passed))
+                except Exception as e:
+                    print(f"✗ FAIL: {test_name} crashed: {e}")
+                    results.append((test_name, False))
+        finally:
+            if worker is not None:
+                stop_worker(worker)
+            close_storage(os.environ["QUEUECTL_DB_PATH"])
+    return output.getvalue(), results
+
+
 def main():
     """Run all core tests."""
-    print("=" * 60)
+    print(_BAR)
     print("CORE TESTS - queuectl Job Queue System")
-    print("=" * 60)
+    print(_BAR)
     
-    # Clean up
-    cleanup()
-    
-    # Run tests
+    # Tests in the same group share a database and run in order (the worker
+    # tests also drain earlier tests' jobs); groups are independent and run
+    # in parallel, each on its own database (see group_db_path())
     tests = [
-        ("Enqueue Job", test_enqueue),
-        ("Worker Execution", test_worker_execution),
-        ("Job Failure", test_job_failure),
-        ("Retry and DLQ", test_retry_and_dlq),
-        ("Multi-Worker", test_multi_worker),
-        ("Status Command", test_status),
-        ("Priority Queue Ordering", test_priority_queue),
-        ("Default Priority", test_default_priority),
-        ("Invalid Priority Rejection", test_invalid_priority),
+        ("Enqueue Job", test_enqueue, "core"),
+        ("Enqueue Batch", test_enqueue_batch, "core"),
+        ("Worker Execution", test_worker_execution, "core"),
+        ("Job Failure", test_job_failure, "core"),
+        ("Retry and DLQ", test_retry_and_dlq, "core"),
+        ("Multi-Worker", test_multi_worker, "multi"),
+        ("Status Command", test_status, "cli"),
+        ("Priority Queue Ordering", test_priority_queue, "priority"),
+        ("Default Priority", test_default_priority, "cli"),
+        ("Invalid Priority Rejection", test_invalid_priority, "cli"),
+        ("Unusable Log Dir", test_unusable_log_dir, "logdir"),
+        ("Schema Upgrade", test_schema_upgrade, "cli"),
+        ("Enqueue From Stdin", test_enqueue_stdin, "cli"),
+        ("List Unknown Field", test_list_unknown_field, "cli"),
+        ("List Paging", test_list_paging, "cli"),
+        ("Concurrent Worker", test_concurrent_worker, "concurrency"),
+        ("Timer Wheel Tick Boundary", test_timer_wheel_tick_boundary, "timerwheel"),
+        ("Timer Wheel Long Delay", test_timer_wheel_long_delay, "timerwheel"),
+        ("Timer Wheel Idle Gap", test_timer_wheel_idle_gap, "timerwheel"),
+        ("Timer Wheel Empty", test_timer_wheel_empty, "timerwheel"),
+        ("Batch Claim Order", test_batch_claim_order, "batch"),
+        ("Batch Release On Stop", test_batch_release_on_stop, "batch"),
     ]
+    groups = {}
+    for test_name, test_func, group in tests:
+        groups.setdefault(group_db_path(group), []).append((test_name, test_func))
     
-    results = []
-    for test_name, test_func in tests:
-        try:
-            passed = test_func()
-            results.append((test_name, passed))
-        except Exception as e:
-            print(f"✗ FAIL: {test_name} crashed: {e}")
-            results.append((test_name, False))
+    # One throwaway call first: a fresh checkout writes queuectl's .pyc files
+    # here, once, instead of in every parallel group's first few commands
+    run_command_discard_output([*QUEUECTL, '--version'])
+    
+    with multiprocessing.Pool(len(groups)) as pool:
+        group_results = pool.map(run_group, groups.items())
+    
+    passed_by_name = {}
+    for output, results in group_results:
+        print(output, end="")
+        passed_by_name.update(results)
+    results = [(test_name, passed_by_name[test_name]) for test_name, _, _ in tests]
     
     # Print summary
-    print("\n" + "=" * 60)
+    print(_HDR)
     print("TEST SUMMARY")
-    print("=" * 60)
+    print(_BAR)
     
     passed_count = sum(1 for _, passed in results if passed)
     total_count = len(results)
@@ -338,19 +914,21 @@ def main():
         status = "✓ PASS" if passed else "✗ FAIL"
         print(f"{status}: {test_name}")
     
-    print("-" * 60)
+    print(_DASH)
     print(f"Total: {passed_count}/{total_count} tests passed")
     
     if passed_count == total_count:
         print("\n🎉 ALL CORE TESTS PASSED!")
-        cleanup()
+        for db_path in groups:
+            cleanup(db_path)
         return 0
     else:
         print(f"\n⚠️  {total_count - passed_count} test(s) failed")
-        print("Database preserved for debugging: queue.db")
+        print("Databases preserved for debugging:")
+        for db_path in groups:
+            print(f"  {db_path}")
         return 1
 
 
 if __name__ == "__main__":
     sys.exit(main())
-